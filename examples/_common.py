@@ -0,0 +1,100 @@
+"""
+Utilitários compartilhados pelos scripts de teste da Syros
+"""
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict
+from typing import DefaultDict, List, Optional, Tuple
+import math
+import os
+import sys
+import time
+
+BASE_URL = "http://localhost:8080"
+HEALTH_URL = f"{BASE_URL}/health"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Detalhes das respostas só são impressos com -v/--verbose
+VERBOSE = "-v" in sys.argv or "--verbose" in sys.argv
+
+# Latências por endpoint, em nanossegundos; p95 acima do orçamento falha o teste
+LATENCIES: DefaultDict[str, List[int]] = defaultdict(list)
+LATENCY_BUDGET_MS = float(os.environ.get("SYROS_LATENCY_BUDGET_MS", "1000"))
+
+def create_session() -> requests.Session:
+    """Sessão HTTP com keep-alive e retry com backoff para falhas transitórias"""
+    retry = Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(("GET", "POST")),
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    session.mount("http://", HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=16))
+    return session
+
+# Sessão única do processo: scripts executados juntos compartilham o pool
+SESSION = create_session()
+
+def require_server(session: requests.Session = SESSION, timeout: float = 5) -> bool:
+    """Verifica se o servidor está rodando; imprime instruções se não estiver"""
+    try:
+        response = session.get(HEALTH_URL, timeout=timeout)
+        if response.status_code == 200:
+            return True
+    except Exception:
+        pass
+    print("❌ Servidor não está rodando!")
+    print("Execute: cargo run -- --verbose")
+    return False
+
+def timed(name: str, fn, *args, **kwargs):
+    """Executa `fn` registrando a latência (perf_counter_ns) em LATENCIES[name]"""
+    start = time.perf_counter_ns()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        LATENCIES[name].append(time.perf_counter_ns() - start)
+
+def get(session: requests.Session, url: str, name: Optional[str] = None, **kwargs) -> requests.Response:
+    """GET cronometrado; `name` agrupa URLs com partes variáveis"""
+    return timed(name or f"GET {url[len(BASE_URL):]}", session.get, url, **kwargs)
+
+def post_json(session: requests.Session, url: str, payload) -> requests.Response:
+    """POST cronometrado; `payload` é serializado via orjson, exceto se já for bytes"""
+    body = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+    return timed(
+        f"POST {url[len(BASE_URL):]}",
+        session.post, url, data=body, headers=JSON_HEADERS
+    )
+
+def percentile(samples: List[int], q: float) -> int:
+    """Percentil `q` (0-100) pelo método nearest-rank"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+def latency_report() -> Tuple[List[str], bool]:
+    """Tabela p50/p95/p99 por endpoint; indica se o p95 ficou no orçamento"""
+    lines = [
+        f"\n⏱️  Latências (ms, orçamento p95: {LATENCY_BUDGET_MS:.0f} ms):",
+        f"   {'endpoint':<45} {'n':>4} {'p50':>8} {'p95':>8} {'p99':>8}"
+    ]
+    within_budget = True
+    for name, samples in sorted(LATENCIES.items()):
+        p50, p95, p99 = (percentile(samples, q) / 1e6 for q in (50, 95, 99))
+        flag = ""
+        if p95 > LATENCY_BUDGET_MS:
+            within_budget = False
+            flag = " ⚠️"
+        lines.append(f"   {name:<45} {len(samples):>4} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}{flag}")
+    return lines, within_budget
+
+def detail(out: List[str], result) -> None:
+    """Anexa a resposta completa à saída, apenas no modo verboso (-v)"""
+    if VERBOSE:
+        out.append(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str).decode())
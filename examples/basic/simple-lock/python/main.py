@@ -5,23 +5,188 @@ Exemplo básico de uso do Syros para locks distribuídos
 
 import asyncio
 import aiohttp
-import json
+import functools
+import orjson
+import random
 import time
-from typing import Optional
+from time import perf_counter
+from typing import Dict, Optional
+
+try:
+    # Event loop baseado em libuv, opcional (não disponível no Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Corpos já serializados com orjson são enviados como bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Timeouts por chamada: consultas de status falham rápido; operações que
+# alteram estado têm mais folga
+STATUS_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=1, sock_read=4)
+MUTATE_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+_connector: Optional[aiohttp.TCPConnector] = None
+
+def shared_connector() -> aiohttp.TCPConnector:
+    """Pool de conexões (com cache de DNS) compartilhado por todas as sessões"""
+    global _connector
+    if _connector is None or _connector.closed:
+        _connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=32,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+    return _connector
+
+async def close_shared_connector():
+    """Fecha o pool compartilhado; chamar uma vez, ao final do processo"""
+    if _connector is not None:
+        await _connector.close()
+
+# Status HTTP transitórios: vale a pena repetir a chamada
+RETRYABLE_STATUSES = frozenset((408, 425, 429, 500, 502, 503, 504))
+
+# Dentre eles, os que indicam que o servidor recusou a requisição sem
+# processá-la: os únicos em que repetir uma mutação é seguro
+UNPROCESSED_STATUSES = frozenset((408, 425, 429, 503))
+
+class TransientError(Exception):
+    """Resposta transitória do servidor que pode ser repetida"""
+    def __init__(self, status: int, text: str):
+        super().__init__(f"{status} - {text}")
+        self.status = status
+
+class CircuitBreaker:
+    """Circuit breaker CLOSED -> OPEN -> HALF_OPEN para um host"""
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+    
+    def allow(self) -> bool:
+        return self.state != "open"
+    
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class TokenBucket:
+    """Orçamento de novas tentativas, reabastecido a uma taxa fixa"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_retry_budget = TokenBucket(rate=2.0, capacity=20)
+
+def breaker_for(base_url: str) -> CircuitBreaker:
+    """Retorna o circuit breaker compartilhado de um host"""
+    return _breakers.setdefault(base_url, CircuitBreaker())
+
+def safe_to_repeat(error: Exception) -> bool:
+    """Indica se a requisição com certeza não chegou a ser processada"""
+    if isinstance(error, TransientError):
+        return error.status in UNPROCESSED_STATUSES
+    # Falha ao conectar: nada foi enviado. Timeouts e conexões caídas no
+    # meio da resposta podem ter sido processados pelo servidor
+    return isinstance(error, aiohttp.ClientConnectorError)
+
+def with_retry(
+    fallback,
+    max_attempts: int = 5,
+    base: float = 0.05,
+    cap: float = 2.0,
+    idempotent: bool = True
+):
+    """Repete falhas transitórias com backoff exponencial e "full jitter".
+    
+    Erros 4xx (exceto 408/425/429) não são repetidos. Com
+    `idempotent=False` (mutações como adquirir lock ou iniciar saga), só
+    são repetidas falhas em que a requisição certamente não foi
+    processada, evitando duplicá-la. Esgotadas as tentativas, ou com o
+    circuito aberto, a chamada retorna `fallback`.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            breaker = breaker_for(self.base_url)
+            for attempt in range(max_attempts):
+                if not breaker.allow():
+                    print(f"Circuito aberto para {self.base_url}; {fn.__name__} recusado")
+                    return fallback
+                try:
+                    result = await fn(self, *args, **kwargs)
+                except (TransientError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    breaker.record_failure()
+                    if (
+                        attempt + 1 == max_attempts
+                        or not (idempotent or safe_to_repeat(e))
+                        or not _retry_budget.take()
+                    ):
+                        print(f"Erro em {fn.__name__} após {attempt + 1} tentativa(s): {e}")
+                        return fallback
+                    await asyncio.sleep(min(cap, base * 2 ** attempt) * random.random())
+                else:
+                    breaker.record_success()
+                    return result
+        return wrapper
+    return decorator
 
 class SyrosLockClient:
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080",
+        session: Optional[aiohttp.ClientSession] = None
+    ):
         self.base_url = base_url
-        self.session = None
+        # Sessão injetada pertence a quem a criou; só fechamos a nossa
+        self.session = session
+        self._owns_session = session is None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self._owns_session:
+            self.session = aiohttp.ClientSession(
+                connector=shared_connector(),
+                connector_owner=False,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
     
+    @with_retry(fallback=None, idempotent=False)
     async def acquire_lock(
         self, 
         key: str, 
@@ -39,18 +204,28 @@ class SyrosLockClient:
             "wait_timeout_seconds": wait_timeout_seconds
         }
         
+        # O servidor pode segurar a requisição até wait_timeout_seconds
+        timeout = MUTATE_TIMEOUT
+        if wait_timeout_seconds:
+            timeout = aiohttp.ClientTimeout(total=MUTATE_TIMEOUT.total + wait_timeout_seconds)
+        
         async with self.session.post(
             f"{self.base_url}/api/v1/locks", 
-            json=payload
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
+            timeout=timeout
         ) as response:
             if response.status == 200:
-                data = await response.json()
+                data = orjson.loads(await response.read())
                 return data["lock_id"]
             else:
                 error_text = await response.text()
+                if response.status in RETRYABLE_STATUSES:
+                    raise TransientError(response.status, error_text)
                 print(f"Erro ao adquirir lock: {response.status} - {error_text}")
                 return None
     
+    @with_retry(fallback=False)
     async def release_lock(self, key: str, lock_id: str, owner: str = "python-client") -> bool:
         """Libera um lock distribuído"""
         payload = {
@@ -60,22 +235,32 @@ class SyrosLockClient:
         
         async with self.session.delete(
             f"{self.base_url}/api/v1/locks/{key}",
-            json=payload
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
+            timeout=MUTATE_TIMEOUT
         ) as response:
             if response.status == 204:
                 return True
             else:
                 error_text = await response.text()
+                if response.status in RETRYABLE_STATUSES:
+                    raise TransientError(response.status, error_text)
                 print(f"Erro ao liberar lock: {response.status} - {error_text}")
                 return False
     
+    @with_retry(fallback={})
     async def get_lock_status(self, key: str) -> dict:
         """Obtém o status de um lock"""
-        async with self.session.get(f"{self.base_url}/api/v1/locks/{key}/status") as response:
+        async with self.session.get(
+            f"{self.base_url}/api/v1/locks/{key}/status",
+            timeout=STATUS_TIMEOUT
+        ) as response:
             if response.status == 200:
-                return await response.json()
+                return orjson.loads(await response.read())
             else:
                 error_text = await response.text()
+                if response.status in RETRYABLE_STATUSES:
+                    raise TransientError(response.status, error_text)
                 print(f"Erro ao obter status do lock: {response.status} - {error_text}")
                 return {}
 
@@ -88,7 +273,7 @@ async def exemplo_basico():
         
         print(f"\n1. Verificando status inicial do lock '{resource_key}'...")
         status = await client.get_lock_status(resource_key)
-        print(f"Status: {json.dumps(status, indent=2)}")
+        print(f"Status: {orjson.dumps(status, option=orjson.OPT_INDENT_2).decode()}")
         
         print(f"\n2. Tentando adquirir lock para '{resource_key}'...")
         lock_id = await client.acquire_lock(
@@ -103,7 +288,7 @@ async def exemplo_basico():
             
             print(f"\n3. Verificando status após aquisição...")
             status = await client.get_lock_status(resource_key)
-            print(f"Status: {json.dumps(status, indent=2)}")
+            print(f"Status: {orjson.dumps(status, option=orjson.OPT_INDENT_2).decode()}")
             
             print(f"\n4. Simulando trabalho crítico por 5 segundos...")
             await asyncio.sleep(5)
@@ -118,7 +303,7 @@ async def exemplo_basico():
             
             print(f"\n6. Verificando status após liberação...")
             status = await client.get_lock_status(resource_key)
-            print(f"Status: {json.dumps(status, indent=2)}")
+            print(f"Status: {orjson.dumps(status, option=orjson.OPT_INDENT_2).decode()}")
         else:
             print("❌ Falha ao adquirir lock")
 
@@ -126,45 +311,49 @@ async def exemplo_concorrencia():
     """Exemplo demonstrando concorrência entre workers"""
     print("\n🏃‍♂️ Exemplo de concorrência entre workers")
     
-    async def worker(worker_id: str, delay: float):
+    async def worker(worker_id: str, delay: float, shared: aiohttp.ClientSession):
         await asyncio.sleep(delay)
         
-        async with SyrosLockClient() as client:
-            resource_key = "recurso_compartilhado"
-            
-            print(f"Worker {worker_id}: Tentando adquirir lock...")
-            start_time = time.time()
+        client = SyrosLockClient(session=shared)
+        resource_key = "recurso_compartilhado"
+        
+        print(f"Worker {worker_id}: Tentando adquirir lock...")
+        start_time = perf_counter()
+        
+        lock_id = await client.acquire_lock(
+            key=resource_key,
+            ttl_seconds=10,
+            owner=f"worker-{worker_id}",
+            wait_timeout_seconds=15
+        )
+        
+        if lock_id:
+            elapsed = perf_counter() - start_time
+            print(f"Worker {worker_id}: ✅ Lock adquirido após {elapsed:.2f}s (ID: {lock_id})")
             
-            lock_id = await client.acquire_lock(
-                key=resource_key,
-                ttl_seconds=10,
-                owner=f"worker-{worker_id}",
-                wait_timeout_seconds=15
-            )
+            # Simular trabalho
+            work_time = 3
+            print(f"Worker {worker_id}: Executando trabalho por {work_time}s...")
+            await asyncio.sleep(work_time)
             
-            if lock_id:
-                elapsed = time.time() - start_time
-                print(f"Worker {worker_id}: ✅ Lock adquirido após {elapsed:.2f}s (ID: {lock_id})")
-                
-                # Simular trabalho
-                work_time = 3
-                print(f"Worker {worker_id}: Executando trabalho por {work_time}s...")
-                await asyncio.sleep(work_time)
-                
-                # Liberar lock
-                await client.release_lock(resource_key, lock_id, f"worker-{worker_id}")
-                print(f"Worker {worker_id}: ✅ Lock liberado")
-            else:
-                print(f"Worker {worker_id}: ❌ Timeout ao aguardar lock")
-    
-    # Iniciar 3 workers com delays diferentes
-    tasks = [
-        asyncio.create_task(worker("A", 0)),
-        asyncio.create_task(worker("B", 1)),
-        asyncio.create_task(worker("C", 2)),
-    ]
+            # Liberar lock
+            await client.release_lock(resource_key, lock_id, f"worker-{worker_id}")
+            print(f"Worker {worker_id}: ✅ Lock liberado")
+        else:
+            print(f"Worker {worker_id}: ❌ Timeout ao aguardar lock")
     
-    await asyncio.gather(*tasks)
+    # Uma única sessão (e pool de conexões) compartilhada por todos os workers
+    async with aiohttp.ClientSession(
+        connector=shared_connector(), connector_owner=False
+    ) as shared:
+        # Iniciar 3 workers com delays diferentes
+        tasks = [
+            asyncio.create_task(worker("A", 0, shared)),
+            asyncio.create_task(worker("B", 1, shared)),
+            asyncio.create_task(worker("C", 2, shared)),
+        ]
+        
+        await asyncio.gather(*tasks)
 
 async def main():
     """Função principal"""
@@ -178,6 +367,10 @@ async def main():
         print("\n✅ Exemplos executados com sucesso!")
     except Exception as e:
         print(f"\n❌ Erro durante execução: {e}")
+    finally:
+        await close_shared_connector()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
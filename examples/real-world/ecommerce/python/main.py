@@ -6,10 +6,182 @@ Demonstra como orquestrar uma transação distribuída para processamento de ped
 
 import asyncio
 import aiohttp
-import json
+import functools
+import orjson
+import random
+import time
 import uuid
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+import websockets
+from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+
+try:
+    # Event loop baseado em libuv, opcional (não disponível no Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Intervalo (segundos) entre consultas de status de uma saga
+POLL_MIN_DELAY = 0.1
+POLL_MAX_DELAY = 2.0
+
+# Corpos já serializados com orjson são enviados como bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Timeouts por chamada: consultas de status falham rápido; operações que
+# alteram estado têm mais folga
+STATUS_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=1, sock_read=4)
+MUTATE_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+# Status a partir dos quais uma saga não progride mais
+TERMINAL_SAGA_STATUSES = frozenset(("completed", "failed", "compensated"))
+
+# Mensagem fixa de inscrição nos eventos de saga do WebSocket
+SUBSCRIBE_SAGA_MESSAGE = orjson.dumps({"type": "subscribe", "topic": "saga"}).decode()
+
+_connector: Optional[aiohttp.TCPConnector] = None
+
+def shared_connector() -> aiohttp.TCPConnector:
+    """Pool de conexões (com cache de DNS) compartilhado por todas as sessões"""
+    global _connector
+    if _connector is None or _connector.closed:
+        _connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=32,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+    return _connector
+
+async def close_shared_connector():
+    """Fecha o pool compartilhado; chamar uma vez, ao final do processo"""
+    if _connector is not None:
+        await _connector.close()
+
+# Status HTTP transitórios: vale a pena repetir a chamada
+RETRYABLE_STATUSES = frozenset((408, 425, 429, 500, 502, 503, 504))
+
+# Dentre eles, os que indicam que o servidor recusou a requisição sem
+# processá-la: os únicos em que repetir uma mutação é seguro
+UNPROCESSED_STATUSES = frozenset((408, 425, 429, 503))
+
+class TransientError(Exception):
+    """Resposta transitória do servidor que pode ser repetida"""
+    def __init__(self, status: int, text: str):
+        super().__init__(f"{status} - {text}")
+        self.status = status
+
+class SagaFailedError(Exception):
+    """Saga terminou sem sucesso (falhou ou foi compensada)"""
+    def __init__(self, saga_id: str, status: str):
+        super().__init__(f"Saga {saga_id} terminou com status {status}")
+        self.saga_id = saga_id
+        self.status = status
+
+class CircuitBreaker:
+    """Circuit breaker CLOSED -> OPEN -> HALF_OPEN para um host"""
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+    
+    def allow(self) -> bool:
+        return self.state != "open"
+    
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class TokenBucket:
+    """Orçamento de novas tentativas, reabastecido a uma taxa fixa"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_retry_budget = TokenBucket(rate=2.0, capacity=20)
+
+def breaker_for(base_url: str) -> CircuitBreaker:
+    """Retorna o circuit breaker compartilhado de um host"""
+    return _breakers.setdefault(base_url, CircuitBreaker())
+
+def safe_to_repeat(error: Exception) -> bool:
+    """Indica se a requisição com certeza não chegou a ser processada"""
+    if isinstance(error, TransientError):
+        return error.status in UNPROCESSED_STATUSES
+    # Falha ao conectar: nada foi enviado. Timeouts e conexões caídas no
+    # meio da resposta podem ter sido processados pelo servidor
+    return isinstance(error, aiohttp.ClientConnectorError)
+
+def with_retry(
+    fallback,
+    max_attempts: int = 5,
+    base: float = 0.05,
+    cap: float = 2.0,
+    idempotent: bool = True
+):
+    """Repete falhas transitórias com backoff exponencial e "full jitter".
+    
+    Erros 4xx (exceto 408/425/429) não são repetidos. Com
+    `idempotent=False` (mutações como adquirir lock ou iniciar saga), só
+    são repetidas falhas em que a requisição certamente não foi
+    processada, evitando duplicá-la. Esgotadas as tentativas, ou com o
+    circuito aberto, a chamada retorna `fallback`.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            breaker = breaker_for(self.base_url)
+            for attempt in range(max_attempts):
+                if not breaker.allow():
+                    print(f"Circuito aberto para {self.base_url}; {fn.__name__} recusado")
+                    return fallback
+                try:
+                    result = await fn(self, *args, **kwargs)
+                except (TransientError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    breaker.record_failure()
+                    if (
+                        attempt + 1 == max_attempts
+                        or not (idempotent or safe_to_repeat(e))
+                        or not _retry_budget.take()
+                    ):
+                        print(f"Erro em {fn.__name__} após {attempt + 1} tentativa(s): {e}")
+                        return fallback
+                    await asyncio.sleep(min(cap, base * 2 ** attempt) * random.random())
+                else:
+                    breaker.record_success()
+                    return result
+        return wrapper
+    return decorator
 
 @dataclass
 class Produto:
@@ -18,11 +190,20 @@ class Produto:
     preco: float
     estoque: int
 
-@dataclass
+@dataclass(frozen=True)
 class ItemPedido:
     produto_id: str
     quantidade: int
     preco_unitario: float
+    
+    @functools.cached_property
+    def as_dict(self) -> Dict:
+        # Item imutável: o dict é montado uma vez e reaproveitado entre pedidos
+        return {
+            "produto_id": self.produto_id,
+            "quantidade": self.quantidade,
+            "preco_unitario": self.preco_unitario
+        }
 
 @dataclass
 class Pedido:
@@ -31,20 +212,41 @@ class Pedido:
     itens: List[ItemPedido]
     valor_total: float
     status: str = "pendente"
+    
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "usuario_id": self.usuario_id,
+            "itens": [item.as_dict for item in self.itens],
+            "valor_total": self.valor_total,
+            "status": self.status
+        }
 
 class SyrosSagaClient:
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080",
+        session: Optional[aiohttp.ClientSession] = None
+    ):
         self.base_url = base_url
-        self.session = None
+        # Sessão injetada pertence a quem a criou; só fechamos a nossa
+        self.session = session
+        self._owns_session = session is None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self._owns_session:
+            self.session = aiohttp.ClientSession(
+                connector=shared_connector(),
+                connector_owner=False,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
     
+    @with_retry(fallback=None, idempotent=False)
     async def start_saga(
         self,
         name: str,
@@ -60,27 +262,83 @@ class SyrosSagaClient:
         
         async with self.session.post(
             f"{self.base_url}/api/v1/sagas",
-            json=payload
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
+            timeout=MUTATE_TIMEOUT
         ) as response:
             if response.status == 200:
-                data = await response.json()
+                data = orjson.loads(await response.read())
                 return data["saga_id"]
             else:
                 error_text = await response.text()
+                if response.status in RETRYABLE_STATUSES:
+                    raise TransientError(response.status, error_text)
                 print(f"Erro ao iniciar saga: {response.status} - {error_text}")
                 return None
     
+    @with_retry(fallback={})
     async def get_saga_status(self, saga_id: str) -> Dict:
         """Obtém o status de uma saga"""
         async with self.session.get(
-            f"{self.base_url}/api/v1/sagas/{saga_id}/status"
+            f"{self.base_url}/api/v1/sagas/{saga_id}/status",
+            timeout=STATUS_TIMEOUT
         ) as response:
             if response.status == 200:
-                return await response.json()
+                return orjson.loads(await response.read())
             else:
                 error_text = await response.text()
+                if response.status in RETRYABLE_STATUSES:
+                    raise TransientError(response.status, error_text)
                 print(f"Erro ao obter status da saga: {response.status} - {error_text}")
                 return {}
+    
+    async def get_many_saga_status(self, saga_ids: List[str]) -> Dict[str, Dict]:
+        """Obtém o status de várias sagas de uma vez"""
+        # A API não expõe status em lote; as consultas seguem em paralelo
+        # sobre o mesmo pool de conexões da sessão
+        statuses = await asyncio.gather(
+            *(self.get_saga_status(saga_id) for saga_id in saga_ids)
+        )
+        return dict(zip(saga_ids, statuses))
+    
+    async def wait_for_saga(
+        self,
+        saga_id: str,
+        timeout: float,
+        on_update: Optional[Callable[[Dict], object]] = None,
+        max_wait: int = 30
+    ) -> Optional[Dict]:
+        """Aguarda uma saga terminar usando long-polling.
+        
+        Cada requisição fica pendente no servidor até o status mudar (ou
+        `max_wait` segundos) e é reenviada enquanto a saga não termina.
+        Retorna o status final, ou None se o servidor não oferece o
+        endpoint. Levanta asyncio.TimeoutError após `timeout` segundos e
+        TransientError/aiohttp.ClientError em outras falhas.
+        """
+        # Cada requisição pode legitimamente durar até max_wait segundos
+        request_timeout = aiohttp.ClientTimeout(total=max_wait + 5, connect=1)
+        
+        async def long_poll() -> Optional[Dict]:
+            while True:
+                async with self.session.get(
+                    f"{self.base_url}/api/v1/sagas/{saga_id}/wait",
+                    params={"max_wait": max_wait},
+                    timeout=request_timeout
+                ) as response:
+                    if response.status in (404, 405):
+                        return None
+                    if response.status != 200:
+                        error_text = await response.text()
+                        raise TransientError(response.status, error_text)
+                    status = orjson.loads(await response.read())
+                
+                if on_update is not None:
+                    on_update(status)
+                if status.get("status") in TERMINAL_SAGA_STATUSES:
+                    return status
+        
+        return await asyncio.wait_for(long_poll(), timeout)
 
 class EcommerceService:
     """Simula um serviço de e-commerce usando Saga Pattern"""
@@ -94,76 +352,168 @@ class EcommerceService:
         self.pedidos = {}
         self.estoque_reservado = {}
         self.pagamentos = {}
-    
-    def criar_saga_processamento_pedido(self, pedido: Pedido) -> List[Dict]:
-        """Cria os steps da saga para processamento de pedido"""
-        return [
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Atualizações de status (WebSocket ou polling em lote), por saga_id
+        self._saga_updates: Dict[str, asyncio.Queue] = {}
+        self._poller: Optional[asyncio.Task] = None
+        # Desligado na primeira resposta indicando que o servidor não o suporta
+        self._long_poll_supported = True
+        # Parte fixa (e imutável) dos steps da saga de pedido; só o payload
+        # muda por pedido
+        self._step_template = tuple(MappingProxyType(step) for step in [
             {
                 "name": "validar_pedido",
                 "service": "order-service",
                 "action": "validate",
                 "compensation": "cancel_validation",
-                "timeout_seconds": 30,
-                "payload": asdict(pedido)
+                "timeout_seconds": 30
             },
             {
                 "name": "reservar_estoque",
-                "service": "inventory-service", 
+                "service": "inventory-service",
                 "action": "reserve",
                 "compensation": "release_reservation",
-                "timeout_seconds": 45,
-                "payload": {
-                    "pedido_id": pedido.id,
-                    "itens": [asdict(item) for item in pedido.itens]
-                }
+                "timeout_seconds": 45
             },
             {
                 "name": "processar_pagamento",
                 "service": "payment-service",
                 "action": "charge",
                 "compensation": "refund",
-                "timeout_seconds": 60,
-                "payload": {
-                    "pedido_id": pedido.id,
-                    "usuario_id": pedido.usuario_id,
-                    "valor": pedido.valor_total,
-                    "metodo": "cartao_credito"
-                }
+                "timeout_seconds": 60
             },
             {
                 "name": "confirmar_estoque",
                 "service": "inventory-service",
                 "action": "confirm",
                 "compensation": "restore_stock",
-                "timeout_seconds": 30,
-                "payload": {
-                    "pedido_id": pedido.id,
-                    "itens": [asdict(item) for item in pedido.itens]
-                }
+                "timeout_seconds": 30
             },
             {
                 "name": "enviar_pedido",
                 "service": "shipping-service",
                 "action": "ship",
                 "compensation": "cancel_shipment",
-                "timeout_seconds": 120,
-                "payload": {
-                    "pedido_id": pedido.id,
-                    "endereco": "Rua Exemplo, 123",
-                    "itens": [asdict(item) for item in pedido.itens]
-                }
+                "timeout_seconds": 120
             },
             {
                 "name": "finalizar_pedido",
                 "service": "order-service",
                 "action": "complete",
                 "compensation": "mark_as_failed",
-                "timeout_seconds": 30,
-                "payload": {
-                    "pedido_id": pedido.id,
-                    "status": "enviado"
-                }
+                "timeout_seconds": 30
+            }
+        ])
+    
+    async def start(self):
+        """Cria a sessão HTTP compartilhada por todas as chamadas ao Syros"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=shared_connector(),
+                connector_owner=False
+            )
+    
+    async def close(self):
+        """Fecha a sessão HTTP compartilhada"""
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def watch_sagas(self, ws_url: str = "ws://localhost:8080/ws"):
+        """Recebe eventos de saga via WebSocket e os distribui aos monitores"""
+        try:
+            async with websockets.connect(ws_url) as websocket:
+                await websocket.send(SUBSCRIBE_SAGA_MESSAGE)
+                
+                async for message in websocket:
+                    try:
+                        event = orjson.loads(message)
+                    except orjson.JSONDecodeError:
+                        continue
+                    
+                    data = event.get("data")
+                    if not isinstance(data, dict):
+                        continue
+                    
+                    queue = self._saga_updates.get(data.get("saga_id"))
+                    if queue is not None:
+                        queue.put_nowait(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Sem canal de push os monitores continuam consultando via HTTP
+            print(f"⚠️  WebSocket indisponível, usando apenas polling: {e}")
+    
+    async def monitor_all(self):
+        """Consulta em lote o status de todas as sagas monitoradas"""
+        client = SyrosSagaClient(session=self._session)
+        
+        # Um único laço de polling para todas as sagas, com backoff
+        # exponencial e "full jitter": consultas rápidas logo após uma
+        # mudança de estado, espaçadas enquanto nenhuma saga progride
+        delay = POLL_MIN_DELAY
+        last_states: Dict[str, tuple] = {}
+        
+        while self._saga_updates:
+            await asyncio.sleep(random.uniform(0, delay))
+            
+            try:
+                statuses = await client.get_many_saga_status(list(self._saga_updates))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"⚠️  Erro ao consultar status das sagas: {e}")
+                delay = min(POLL_MAX_DELAY, delay * 2)
+                continue
+            
+            changed = False
+            for saga_id, status in statuses.items():
+                queue = self._saga_updates.get(saga_id)
+                if not status or queue is None:
+                    continue
+                
+                state = (status.get("status"), status.get("current_step_index"))
+                if last_states.get(saga_id) != state:
+                    last_states[saga_id] = state
+                    queue.put_nowait(status)
+                    changed = True
+            
+            delay = POLL_MIN_DELAY if changed else min(POLL_MAX_DELAY, delay * 2)
+    
+    def criar_saga_processamento_pedido(self, pedido: Pedido) -> List[Dict]:
+        """Cria os steps da saga para processamento de pedido"""
+        # Serializa o pedido uma única vez; os steps compartilham a lista de itens
+        pedido_dict = pedido.to_dict()
+        itens = pedido_dict["itens"]
+        
+        # Reserva e confirmação de estoque recebem o mesmo payload
+        itens_payload = {"pedido_id": pedido.id, "itens": itens}
+        payloads = {
+            "validar_pedido": pedido_dict,
+            "reservar_estoque": itens_payload,
+            "processar_pagamento": {
+                "pedido_id": pedido.id,
+                "usuario_id": pedido.usuario_id,
+                "valor": pedido.valor_total,
+                "metodo": "cartao_credito"
+            },
+            "confirmar_estoque": itens_payload,
+            "enviar_pedido": {
+                "pedido_id": pedido.id,
+                "endereco": "Rua Exemplo, 123",
+                "itens": itens
+            },
+            "finalizar_pedido": {
+                "pedido_id": pedido.id,
+                "status": "enviado"
             }
+        }
+        
+        return [
+            {**step, "payload": payloads[step["name"]]}
+            for step in self._step_template
         ]
     
     async def processar_pedido_com_saga(self, pedido: Pedido) -> Optional[str]:
@@ -173,68 +523,107 @@ class EcommerceService:
         print(f"   Itens: {len(pedido.itens)}")
         print(f"   Valor Total: R$ {pedido.valor_total:.2f}")
         
-        async with SyrosSagaClient() as client:
-            steps = self.criar_saga_processamento_pedido(pedido)
-            
-            saga_id = await client.start_saga(
-                name=f"processar_pedido_{pedido.id}",
-                steps=steps,
-                metadata={
-                    "pedido_id": pedido.id,
-                    "usuario_id": pedido.usuario_id,
-                    "valor_total": pedido.valor_total,
-                    "tipo": "ecommerce_order"
-                }
-            )
-            
-            if saga_id:
-                print(f"✅ Saga iniciada com ID: {saga_id}")
-                return saga_id
-            else:
-                print("❌ Falha ao iniciar saga")
-                return None
+        client = SyrosSagaClient(session=self._session)
+        steps = self.criar_saga_processamento_pedido(pedido)
+        
+        saga_id = await client.start_saga(
+            name=f"processar_pedido_{pedido.id}",
+            steps=steps,
+            metadata={
+                "pedido_id": pedido.id,
+                "usuario_id": pedido.usuario_id,
+                "valor_total": pedido.valor_total,
+                "tipo": "ecommerce_order"
+            }
+        )
+        
+        if saga_id:
+            print(f"✅ Saga iniciada com ID: {saga_id}")
+            return saga_id
+        else:
+            print("❌ Falha ao iniciar saga")
+            return None
     
     async def monitorar_saga(self, saga_id: str, timeout: int = 300):
-        """Monitora o progresso de uma saga"""
+        """Monitora o progresso de uma saga.
+        
+        Levanta SagaFailedError se a saga terminar sem sucesso.
+        """
         print(f"\n👀 Monitorando saga {saga_id}...")
         
-        async with SyrosSagaClient() as client:
-            start_time = asyncio.get_event_loop().time()
+        last_state = None
+        
+        def exibir(status: Dict) -> bool:
+            """Imprime mudanças de status; retorna True se a saga terminou"""
+            nonlocal last_state
+            saga_status = status.get("status", "unknown")
+            current_step = status.get("current_step_index")
+            
+            if (saga_status, current_step) != last_state:
+                last_state = (saga_status, current_step)
+                
+                print(f"   Status: {saga_status}")
+                if current_step is not None:
+                    print(f"   Step atual: {current_step + 1}/6")
             
+            if saga_status == "completed":
+                print("✅ Pedido processado com sucesso!")
+                return True
+            if saga_status in TERMINAL_SAGA_STATUSES:
+                if saga_status == "compensated":
+                    print("🔄 Pedido falhou, compensação executada")
+                else:
+                    print("❌ Pedido falhou")
+                raise SagaFailedError(saga_id, saga_status)
+            return False
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        
+        # Long-polling: o servidor responde assim que o status da saga muda
+        if self._long_poll_supported:
+            client = SyrosSagaClient(session=self._session)
+            try:
+                status = await client.wait_for_saga(saga_id, timeout, on_update=exibir)
+            except asyncio.TimeoutError:
+                print(f"⏰ Timeout ao monitorar saga {saga_id}")
+                return
+            except (TransientError, aiohttp.ClientError) as e:
+                # Falha pontual: seguir com WebSocket/polling em lote
+                print(f"⚠️  Long-polling falhou para saga {saga_id}: {e}")
+            else:
+                if status is not None:
+                    return
+                # Servidor sem long-polling: não tentar de novo
+                self._long_poll_supported = False
+        
+        updates = self._saga_updates.setdefault(saga_id, asyncio.Queue())
+        
+        # As atualizações chegam pelo WebSocket (watch_sagas) ou pelo polling
+        # em lote (monitor_all), compartilhado entre todos os monitores
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self.monitor_all())
+        
+        try:
             while True:
-                current_time = asyncio.get_event_loop().time()
-                if current_time - start_time > timeout:
+                remaining = deadline - loop.time()
+                
+                try:
+                    status = await asyncio.wait_for(updates.get(), max(remaining, 0))
+                except asyncio.TimeoutError:
                     print(f"⏰ Timeout ao monitorar saga {saga_id}")
                     break
                 
-                status = await client.get_saga_status(saga_id)
-                
-                if status:
-                    saga_status = status.get("status", "unknown")
-                    current_step = status.get("current_step_index")
-                    
-                    print(f"   Status: {saga_status}")
-                    if current_step is not None:
-                        print(f"   Step atual: {current_step + 1}/6")
-                    
-                    if saga_status in ["completed", "failed", "compensated"]:
-                        if saga_status == "completed":
-                            print("✅ Pedido processado com sucesso!")
-                        elif saga_status == "compensated":
-                            print("🔄 Pedido falhou, compensação executada")
-                        else:
-                            print("❌ Pedido falhou")
-                        break
-                
-                await asyncio.sleep(2)
+                if exibir(status):
+                    break
+        finally:
+            self._saga_updates.pop(saga_id, None)
 
-async def exemplo_pedido_sucesso():
+async def exemplo_pedido_sucesso(service: EcommerceService):
     """Exemplo de pedido processado com sucesso"""
     print("\n🛒 Exemplo 1: Pedido processado com sucesso")
     print("=" * 50)
     
-    service = EcommerceService()
-    
     # Criar pedido válido
     pedido = Pedido(
         id=f"pedido_{uuid.uuid4().hex[:8]}",
@@ -249,15 +638,16 @@ async def exemplo_pedido_sucesso():
     saga_id = await service.processar_pedido_com_saga(pedido)
     
     if saga_id:
-        await service.monitorar_saga(saga_id, timeout=60)
+        try:
+            await service.monitorar_saga(saga_id, timeout=60)
+        except SagaFailedError as e:
+            print(f"   {e}")
 
-async def exemplo_pedido_com_falha():
+async def exemplo_pedido_com_falha(service: EcommerceService):
     """Exemplo de pedido que falha e aciona compensação"""
     print("\n💥 Exemplo 2: Pedido com falha e compensação")
     print("=" * 50)
     
-    service = EcommerceService()
-    
     # Criar pedido que pode falhar no pagamento
     pedido = Pedido(
         id=f"pedido_{uuid.uuid4().hex[:8]}",
@@ -272,15 +662,16 @@ async def exemplo_pedido_com_falha():
     saga_id = await service.processar_pedido_com_saga(pedido)
     
     if saga_id:
-        await service.monitorar_saga(saga_id, timeout=60)
+        try:
+            await service.monitorar_saga(saga_id, timeout=60)
+        except SagaFailedError as e:
+            print(f"   {e}")
 
-async def exemplo_multiplos_pedidos():
+async def exemplo_multiplos_pedidos(service: EcommerceService):
     """Exemplo de múltiplos pedidos concorrentes"""
     print("\n🏃‍♂️ Exemplo 3: Múltiplos pedidos concorrentes")
     print("=" * 50)
     
-    service = EcommerceService()
-    
     # Criar múltiplos pedidos
     pedidos = [
         Pedido(
@@ -307,7 +698,28 @@ async def exemplo_multiplos_pedidos():
             task = asyncio.create_task(service.monitorar_saga(saga_id, timeout=120))
             monitor_tasks.append(task)
     
-    await asyncio.gather(*monitor_tasks)
+    if not monitor_tasks:
+        return
+    
+    # Na primeira saga com falha o resultado do lote já está definido:
+    # cancelar os monitores restantes em vez de esperar o timeout
+    # (asyncio.wait em vez de TaskGroup, que exige Python 3.11)
+    done, pending = await asyncio.wait(
+        monitor_tasks, return_when=asyncio.FIRST_EXCEPTION
+    )
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    
+    for task in done:
+        error = task.exception()
+        if error is None:
+            continue
+        if not isinstance(error, SagaFailedError):
+            raise error
+        print(f"🛑 {error}")
+    if pending:
+        print(f"   {len(pending)} monitoramento(s) cancelado(s)")
 
 async def main():
     """Função principal"""
@@ -316,14 +728,18 @@ async def main():
     print("Este exemplo demonstra como usar o Syros para")
     print("orquestrar transações distribuídas em um sistema de e-commerce")
     
+    service = EcommerceService()
+    await service.start()
+    watcher = asyncio.create_task(service.watch_sagas())
+    
     try:
-        await exemplo_pedido_sucesso()
+        await exemplo_pedido_sucesso(service)
         await asyncio.sleep(2)
         
-        await exemplo_pedido_com_falha()
+        await exemplo_pedido_com_falha(service)
         await asyncio.sleep(2)
         
-        await exemplo_multiplos_pedidos()
+        await exemplo_multiplos_pedidos(service)
         
         print("\n✅ Todos os exemplos executados!")
         
@@ -331,6 +747,13 @@ async def main():
         print(f"\n❌ Erro durante execução: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        watcher.cancel()
+        await asyncio.gather(watcher, return_exceptions=True)
+        await service.close()
+        await close_shared_connector()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
@@ -5,101 +5,137 @@ Teste completo de todas as APIs da Syros
 
 import asyncio
 import aiohttp
-import json
+import orjson
 import websockets
 from datetime import datetime
+from typing import List, Optional
 
+try:
+    # Event loop baseado em libuv, opcional (não disponível no Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
 
-async def test_rest_api():
+# Mensagens fixas do protocolo WebSocket, codificadas uma única vez.
+# O servidor só interpreta frames de texto: enviar str, não bytes
+PING_MESSAGE = orjson.dumps({"type": "ping"}).decode()
+SUBSCRIBE_MESSAGE = orjson.dumps({"type": "subscribe"}).decode()
+
+_connector: Optional[aiohttp.TCPConnector] = None
+
+
+def shared_connector() -> aiohttp.TCPConnector:
+    """Pool de conexões (com cache de DNS) compartilhado por todas as sessões"""
+    global _connector
+    if _connector is None or _connector.closed:
+        _connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=32,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+    return _connector
+
+
+async def close_shared_connector():
+    """Fecha o pool compartilhado; chamar uma vez, ao final do processo"""
+    if _connector is not None:
+        await _connector.close()
+
+
+async def probe(session, url, name, field, default):
+    """Executa uma verificação HTTP e retorna (nome, resultado, detalhe)"""
+    try:
+        async with session.get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                return name, "ok", data.get(field, default)
+            return name, "falhou", response.status
+    except Exception as e:
+        return name, "erro", str(e)
+
+
+# As suítes rodam em paralelo: cada uma retorna suas linhas de saída,
+# impressas em ordem ao final, em vez de imprimir enquanto aguarda
+
+async def test_rest_api() -> List[str]:
     """Testa a API REST"""
-    print("🧪 Testando API REST...")
+    out = ["🧪 Testando API REST..."]
     
     base_url = "http://localhost:8080"
     
-    async with aiohttp.ClientSession() as session:
-        # Teste 1: Health Check
-        try:
-            async with session.get(f"{base_url}/health") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print("✅ Health Check:", data.get("status", "unknown"))
-                else:
-                    print("❌ Health Check falhou:", response.status)
-        except Exception as e:
-            print("❌ Health Check erro:", str(e))
-        
-        # Teste 2: Readiness Check
-        try:
-            async with session.get(f"{base_url}/ready") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print("✅ Readiness Check:", data.get("ready", False))
-                else:
-                    print("❌ Readiness Check falhou:", response.status)
-        except Exception as e:
-            print("❌ Readiness Check erro:", str(e))
-        
-        # Teste 3: Liveness Check
-        try:
-            async with session.get(f"{base_url}/live") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print("✅ Liveness Check:", data.get("status", "unknown"))
-                else:
-                    print("❌ Liveness Check falhou:", response.status)
-        except Exception as e:
-            print("❌ Liveness Check erro:", str(e))
+    async with aiohttp.ClientSession(
+        connector=shared_connector(), connector_owner=False
+    ) as session:
+        # As verificações são independentes: executá-las em paralelo
+        results = await asyncio.gather(
+            probe(session, f"{base_url}/health", "Health Check", "status", "unknown"),
+            probe(session, f"{base_url}/ready", "Readiness Check", "ready", False),
+            probe(session, f"{base_url}/live", "Liveness Check", "status", "unknown"),
+        )
+    
+    for name, outcome, detail in results:
+        if outcome == "ok":
+            out.append(f"✅ {name}: {detail}")
+        else:
+            out.append(f"❌ {name} {outcome}: {detail}")
+    return out
 
 
-async def test_websocket_api():
+async def test_websocket_api() -> List[str]:
     """Testa a API WebSocket"""
-    print("\n🧪 Testando API WebSocket...")
+    out = ["\n🧪 Testando API WebSocket..."]
     
     try:
         async with websockets.connect("ws://localhost:8080/ws") as websocket:
             # Aguardar mensagem de boas-vindas
             welcome_msg = await websocket.recv()
-            welcome_data = json.loads(welcome_msg)
-            print("✅ WebSocket conectado:", welcome_data.get("type", "unknown"))
+            welcome_data = orjson.loads(welcome_msg)
+            out.append(f"✅ WebSocket conectado: {welcome_data.get('type', 'unknown')}")
             
             # Enviar ping
-            await websocket.send(json.dumps({"type": "ping"}))
+            await websocket.send(PING_MESSAGE)
             
             # Aguardar pong
             pong_msg = await websocket.recv()
-            pong_data = json.loads(pong_msg)
-            print("✅ Ping/Pong funcionando:", pong_data.get("type", "unknown"))
+            pong_data = orjson.loads(pong_msg)
+            out.append(f"✅ Ping/Pong funcionando: {pong_data.get('type', 'unknown')}")
             
             # Inscrever-se para eventos
-            await websocket.send(json.dumps({"type": "subscribe"}))
+            await websocket.send(SUBSCRIBE_MESSAGE)
             
             # Aguardar confirmação de inscrição
             sub_msg = await websocket.recv()
-            sub_data = json.loads(sub_msg)
-            print("✅ Inscrição confirmada:", sub_data.get("type", "unknown"))
+            sub_data = orjson.loads(sub_msg)
+            out.append(f"✅ Inscrição confirmada: {sub_data.get('type', 'unknown')}")
             
     except Exception as e:
-        print("❌ WebSocket erro:", str(e))
+        out.append(f"❌ WebSocket erro: {str(e)}")
+    return out
 
 
-async def test_grpc_endpoints():
+async def test_grpc_endpoints() -> List[str]:
     """Testa se os endpoints gRPC estão disponíveis"""
-    print("\n🧪 Testando endpoints gRPC...")
+    out = ["\n🧪 Testando endpoints gRPC..."]
     
     base_url = "http://localhost:9090"
     
-    async with aiohttp.ClientSession() as session:
+    async with aiohttp.ClientSession(
+        connector=shared_connector(), connector_owner=False
+    ) as session:
         try:
             # Tentar conectar ao servidor gRPC (HTTP/2)
             async with session.get(f"{base_url}/") as response:
-                print(f"✅ Servidor gRPC respondendo: {response.status}")
+                out.append(f"✅ Servidor gRPC respondendo: {response.status}")
         except Exception as e:
-            print("❌ Servidor gRPC erro:", str(e))
+            out.append(f"❌ Servidor gRPC erro: {str(e)}")
+    return out
 
 
-async def test_sdk_python():
+async def test_sdk_python() -> List[str]:
     """Testa o SDK Python"""
-    print("\n🧪 Testando SDK Python...")
+    out = ["\n🧪 Testando SDK Python..."]
     
     try:
         import sys
@@ -109,7 +145,7 @@ async def test_sdk_python():
         async with SyrosClient("http://localhost:8080") as client:
             # Health check
             health = await client.health_check()
-            print("✅ SDK Health Check:", health.get("status", "unknown"))
+            out.append(f"✅ SDK Health Check: {health.get('status', 'unknown')}")
             
             # Lock test
             lock_request = LockRequest(
@@ -119,7 +155,7 @@ async def test_sdk_python():
             )
             
             lock_response = await client.acquire_lock(lock_request)
-            print("✅ SDK Lock adquirido:", lock_response.success)
+            out.append(f"✅ SDK Lock adquirido: {lock_response.success}")
             
             # Cache test
             cache_request = CacheRequest(
@@ -129,12 +165,13 @@ async def test_sdk_python():
             )
             
             cache_response = await client.set_cache(cache_request)
-            print("✅ SDK Cache definido:", cache_response.success)
+            out.append(f"✅ SDK Cache definido: {cache_response.success}")
             
     except ImportError:
-        print("❌ SDK Python não disponível (dependências não instaladas)")
+        out.append("❌ SDK Python não disponível (dependências não instaladas)")
     except Exception as e:
-        print("❌ SDK Python erro:", str(e))
+        out.append(f"❌ SDK Python erro: {str(e)}")
+    return out
 
 
 async def main():
@@ -142,10 +179,18 @@ async def main():
     print("🚀 Syros - Teste Completo de APIs")
     print("=" * 50)
     
-    await test_rest_api()
-    await test_websocket_api()
-    await test_grpc_endpoints()
-    await test_sdk_python()
+    # Cada suíte fala com um endpoint diferente; rodam em paralelo
+    try:
+        outputs = await asyncio.gather(
+            test_rest_api(),
+            test_websocket_api(),
+            test_grpc_endpoints(),
+            test_sdk_python(),
+        )
+    finally:
+        await close_shared_connector()
+    for out in outputs:
+        print("\n".join(out))
     
     print("\n" + "=" * 50)
     print("✅ Testes concluídos!")
@@ -158,4 +203,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
@@ -3,250 +3,341 @@
 Teste da API de Autenticação da Syros
 """
 
+import orjson
 import requests
-import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+import statistics
+import sys
 import time
 
-def test_auth_api():
-    """Testa a API de autenticação"""
-    print("🔐 Syros - Teste de Autenticação")
-    print("=" * 50)
-    
-    base_url = "http://localhost:8080"
-    
-    # Verificar se o servidor está rodando
-    try:
-        response = requests.get(f"{base_url}/health", timeout=5)
-        if response.status_code != 200:
-            print("❌ Servidor não está rodando!")
-            print("Execute: cargo run -- --verbose")
-            return False
-    except Exception as e:
-        print("❌ Servidor não está rodando!")
-        print("Execute: cargo run -- --verbose")
-        return False
-    
-    success_count = 0
-    total_tests = 0
-    
-    # Teste 1: Login com credenciais válidas
-    print("\n🔑 Testando Login...")
-    total_tests += 1
+from _common import (
+    BASE_URL, LATENCIES, LATENCY_BUDGET_MS, SESSION, detail, get, latency_report, post_json,
+    require_server
+)
+
+# Endpoints montados uma única vez
+LOGIN_URL = f"{BASE_URL}/api/v1/auth/login"
+API_KEYS_URL = f"{BASE_URL}/api/v1/auth/api-keys"
+AUTH_STATS_URL = f"{BASE_URL}/api/v1/auth/stats"
+TOKEN_URL = f"{BASE_URL}/api/v1/auth/token"
+API_KEY_LOCK_STATUS_URL = f"{BASE_URL}/api/v1/locks/test_key/status"
+JWT_LOCK_STATUS_URL = f"{BASE_URL}/api/v1/locks/test_jwt/status"
+JWT_PROBE_NAME = "GET /api/v1/locks/test_jwt/status (cache JWT)"
+
+# Corpos JSON constantes, serializados uma única vez na importação
+ADMIN_LOGIN_BODY = orjson.dumps({
+    "username": "admin",
+    "password": "admin123"
+})
+USER_LOGIN_BODY = orjson.dumps({
+    "username": "user",
+    "password": "user123"
+})
+INVALID_LOGIN_BODY = orjson.dumps({
+    "username": "invalid",
+    "password": "invalid"
+})
+API_KEY_BODY = orjson.dumps({
+    "name": "test_api_key",
+    "description": "API key para testes",
+    "permissions": ["read", "write"],
+    "expires_in_days": 30
+})
+TOKEN_BODY = orjson.dumps({
+    "user_id": "custom_user_123",
+    "role": "developer",
+    "expiration_hours": 12
+})
+
+# Os testes abaixo rodam em paralelo: cada um acumula sua saída em `out`
+# (impressa em ordem ao final) e retorna (testes bem-sucedidos, total).
+# Testes que dependem de outro (login -> acesso com JWT, criação de
+# API Key -> acesso com API Key) ficam encadeados na mesma função.
+
+def test_login_admin(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 1: Login com credenciais válidas, seguido do Teste 9"""
+    out.append("\n🔑 Testando Login...")
+    token = None
     try:
-        login_data = {
-            "username": "admin",
-            "password": "admin123"
-        }
-        
-        response = requests.post(f"{base_url}/api/v1/auth/login", json=login_data)
+        response = post_json(session, LOGIN_URL, ADMIN_LOGIN_BODY)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             token = result['token']
-            print(f"    ✅ Login admin bem-sucedido!")
-            print(f"    🔑 Token: {token[:50]}...")
-            print(f"    👤 User ID: {result['user_id']}")
-            print(f"    🎭 Role: {result['role']}")
-            print(f"    ⏰ Expires in: {result['expires_in']} seconds")
-            success_count += 1
+            out.append(f"    ✅ Login admin bem-sucedido!")
+            detail(out, result)
         else:
-            print(f"    ❌ Login admin falhou: HTTP {response.status_code}")
+            out.append(f"    ❌ Login admin falhou: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro no login admin: {str(e)}")
+        out.append(f"    ❌ Erro no login admin: {str(e)}")
     
-    # Teste 2: Login com usuário comum
-    print("\n👤 Testando Login de Usuário...")
-    total_tests += 1
+    if token is None:
+        return 0, 1
+    return 1 + test_jwt_access(session, token, out), 2
+
+def test_login_user(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 2: Login com usuário comum"""
+    out.append("\n👤 Testando Login de Usuário...")
     try:
-        login_data = {
-            "username": "user",
-            "password": "user123"
-        }
-        
-        response = requests.post(f"{base_url}/api/v1/auth/login", json=login_data)
+        response = post_json(session, LOGIN_URL, USER_LOGIN_BODY)
         if response.status_code == 200:
-            result = response.json()
-            user_token = result['token']
-            print(f"    ✅ Login user bem-sucedido!")
-            print(f"    🔑 Token: {user_token[:50]}...")
-            print(f"    👤 User ID: {result['user_id']}")
-            print(f"    🎭 Role: {result['role']}")
-            success_count += 1
+            result = orjson.loads(response.content)
+            out.append(f"    ✅ Login user bem-sucedido!")
+            detail(out, result)
+            return 1, 1
         else:
-            print(f"    ❌ Login user falhou: HTTP {response.status_code}")
+            out.append(f"    ❌ Login user falhou: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro no login user: {str(e)}")
-    
-    # Teste 3: Login com credenciais inválidas
-    print("\n🚫 Testando Login Inválido...")
-    total_tests += 1
+        out.append(f"    ❌ Erro no login user: {str(e)}")
+    return 0, 1
+
+def test_login_invalid(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 3: Login com credenciais inválidas"""
+    out.append("\n🚫 Testando Login Inválido...")
     try:
-        login_data = {
-            "username": "invalid",
-            "password": "invalid"
-        }
-        
-        response = requests.post(f"{base_url}/api/v1/auth/login", json=login_data)
+        response = post_json(session, LOGIN_URL, INVALID_LOGIN_BODY)
         if response.status_code == 401:
-            print(f"    ✅ Login inválido rejeitado corretamente!")
-            success_count += 1
+            out.append(f"    ✅ Login inválido rejeitado corretamente!")
+            return 1, 1
         else:
-            print(f"    ❌ Login inválido deveria retornar 401, retornou: {response.status_code}")
+            out.append(f"    ❌ Login inválido deveria retornar 401, retornou: {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro no teste de login inválido: {str(e)}")
-    
-    # Teste 4: Criar API Key
-    print("\n🔑 Testando Criação de API Key...")
-    total_tests += 1
+        out.append(f"    ❌ Erro no teste de login inválido: {str(e)}")
+    return 0, 1
+
+def test_create_api_key(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 4: Criar API Key, seguido do Teste 8"""
+    out.append("\n🔑 Testando Criação de API Key...")
+    api_key = None
     try:
-        api_key_data = {
-            "name": "test_api_key",
-            "description": "API key para testes",
-            "permissions": ["read", "write"],
-            "expires_in_days": 30
-        }
-        
-        response = requests.post(f"{base_url}/api/v1/auth/api-keys", json=api_key_data)
+        response = post_json(session, API_KEYS_URL, API_KEY_BODY)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             api_key = result['key']
-            api_key_id = result['id']
-            print(f"    ✅ API Key criada com sucesso!")
-            print(f"    🔑 Key: {api_key[:20]}...")
-            print(f"    🆔 ID: {api_key_id}")
-            print(f"    📝 Name: {result['name']}")
-            print(f"    🔐 Permissions: {result['permissions']}")
-            success_count += 1
+            out.append(f"    ✅ API Key criada com sucesso!")
+            detail(out, result)
         else:
-            print(f"    ❌ Criação de API Key falhou: HTTP {response.status_code}")
-            api_key = None
-            api_key_id = None
+            out.append(f"    ❌ Criação de API Key falhou: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro na criação de API Key: {str(e)}")
-        api_key = None
-        api_key_id = None
+        out.append(f"    ❌ Erro na criação de API Key: {str(e)}")
     
-    # Teste 5: Listar API Keys
-    print("\n📋 Testando Listagem de API Keys...")
-    total_tests += 1
+    if api_key is None:
+        return 0, 1
+    return 1 + test_api_key_access(session, api_key, out), 2
+
+def test_list_api_keys(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 5: Listar API Keys"""
+    out.append("\n📋 Testando Listagem de API Keys...")
     try:
-        response = requests.get(f"{base_url}/api/v1/auth/api-keys")
+        response = get(session, API_KEYS_URL)
         if response.status_code == 200:
-            result = response.json()
-            print(f"    ✅ API Keys listadas com sucesso!")
-            print(f"    📊 Total de keys: {len(result)}")
-            for key in result:
-                print(f"      - {key['name']}: {key['key']}")
-            success_count += 1
+            result = orjson.loads(response.content)
+            out.append(f"    ✅ API Keys listadas com sucesso!")
+            out.append(f"    📊 Total de keys: {len(result)}")
+            detail(out, result)
+            return 1, 1
         else:
-            print(f"    ❌ Listagem de API Keys falhou: HTTP {response.status_code}")
+            out.append(f"    ❌ Listagem de API Keys falhou: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro na listagem de API Keys: {str(e)}")
-    
-    # Teste 6: Estatísticas de API Keys
-    print("\n📊 Testando Estatísticas de API Keys...")
-    total_tests += 1
+        out.append(f"    ❌ Erro na listagem de API Keys: {str(e)}")
+    return 0, 1
+
+def test_api_key_stats(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 6: Estatísticas de API Keys"""
+    out.append("\n📊 Testando Estatísticas de API Keys...")
     try:
-        response = requests.get(f"{base_url}/api/v1/auth/stats")
+        response = get(session, AUTH_STATS_URL)
         if response.status_code == 200:
-            result = response.json()
-            print(f"    ✅ Estatísticas obtidas com sucesso!")
-            print(f"    📊 Total keys: {result['total_keys']}")
-            print(f"    ✅ Active keys: {result['active_keys']}")
-            print(f"    ⏰ Expired keys: {result['expired_keys']}")
-            print(f"    🔢 Total usage: {result['total_usage']}")
-            success_count += 1
+            result = orjson.loads(response.content)
+            out.append(f"    ✅ Estatísticas obtidas com sucesso!")
+            detail(out, result)
+            return 1, 1
         else:
-            print(f"    ❌ Estatísticas de API Keys falharam: HTTP {response.status_code}")
+            out.append(f"    ❌ Estatísticas de API Keys falharam: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro nas estatísticas de API Keys: {str(e)}")
-    
-    # Teste 7: Criar Token personalizado
-    print("\n🎫 Testando Criação de Token Personalizado...")
-    total_tests += 1
+        out.append(f"    ❌ Erro nas estatísticas de API Keys: {str(e)}")
+    return 0, 1
+
+def test_custom_token(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 7: Criar Token personalizado"""
+    out.append("\n🎫 Testando Criação de Token Personalizado...")
     try:
-        token_data = {
-            "user_id": "custom_user_123",
-            "role": "developer",
-            "expiration_hours": 12
+        response = post_json(session, TOKEN_URL, TOKEN_BODY)
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            out.append(f"    ✅ Token personalizado criado com sucesso!")
+            detail(out, result)
+            return 1, 1
+        else:
+            out.append(f"    ❌ Criação de token personalizado falhou: HTTP {response.status_code}")
+    except Exception as e:
+        out.append(f"    ❌ Erro na criação de token personalizado: {str(e)}")
+    return 0, 1
+
+def test_api_key_access(session: requests.Session, api_key: str, out: List[str]) -> int:
+    """Teste 8: Usar API Key para acessar endpoint protegido"""
+    out.append("\n🔐 Testando Acesso com API Key...")
+    try:
+        headers = {
+            "x-api-key": api_key
         }
         
-        response = requests.post(f"{base_url}/api/v1/auth/token", json=token_data)
+        response = get(session, API_KEY_LOCK_STATUS_URL, headers=headers)
         if response.status_code == 200:
-            result = response.json()
-            custom_token = result['token']
-            print(f"    ✅ Token personalizado criado com sucesso!")
-            print(f"    🔑 Token: {custom_token[:50]}...")
-            print(f"    ⏰ Expires in: {result['expires_in']} seconds")
-            success_count += 1
+            out.append(f"    ✅ Acesso com API Key bem-sucedido!")
+            return 1
         else:
-            print(f"    ❌ Criação de token personalizado falhou: HTTP {response.status_code}")
+            out.append(f"    ❌ Acesso com API Key falhou: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro na criação de token personalizado: {str(e)}")
-    
-    # Teste 8: Usar API Key para acessar endpoint protegido
-    if api_key:
-        print("\n🔐 Testando Acesso com API Key...")
-        total_tests += 1
-        try:
-            headers = {
-                "x-api-key": api_key
-            }
-            
-            response = requests.get(f"{base_url}/api/v1/locks/test_key/status", headers=headers)
-            if response.status_code == 200:
-                print(f"    ✅ Acesso com API Key bem-sucedido!")
-                success_count += 1
-            else:
-                print(f"    ❌ Acesso com API Key falhou: HTTP {response.status_code}")
-        except Exception as e:
-            print(f"    ❌ Erro no acesso com API Key: {str(e)}")
-    
-    # Teste 9: Usar JWT Token para acessar endpoint protegido
-    if 'token' in locals():
-        print("\n🎫 Testando Acesso com JWT Token...")
-        total_tests += 1
-        try:
-            headers = {
-                "Authorization": f"Bearer {token}"
-            }
-            
-            response = requests.get(f"{base_url}/api/v1/locks/test_jwt/status", headers=headers)
-            if response.status_code == 200:
-                print(f"    ✅ Acesso com JWT Token bem-sucedido!")
-                success_count += 1
-            else:
-                print(f"    ❌ Acesso com JWT Token falhou: HTTP {response.status_code}")
-        except Exception as e:
-            print(f"    ❌ Erro no acesso com JWT Token: {str(e)}")
+        out.append(f"    ❌ Erro no acesso com API Key: {str(e)}")
+    return 0
+
+def test_jwt_access(session: requests.Session, token: str, out: List[str]) -> int:
+    """Teste 9: Usar JWT Token para acessar endpoint protegido"""
+    out.append("\n🎫 Testando Acesso com JWT Token...")
+    try:
+        headers = {
+            "Authorization": f"Bearer {token}"
+        }
+        
+        response = get(session, JWT_LOCK_STATUS_URL, headers=headers)
+        if response.status_code == 200:
+            out.append(f"    ✅ Acesso com JWT Token bem-sucedido!")
+            return 1
+        else:
+            out.append(f"    ❌ Acesso com JWT Token falhou: HTTP {response.status_code}")
+    except Exception as e:
+        out.append(f"    ❌ Erro no acesso com JWT Token: {str(e)}")
+    return 0
+
+def probe_jwt_cache(session: requests.Session, out: List[str], n: int = 100) -> Tuple[int, int]:
+    """Teste 10: Reutilizar um JWT recém-emitido em `n` requisições.
     
-    # Resumo final
-    print("\n" + "=" * 50)
-    print("📋 RESUMO FINAL - AUTENTICAÇÃO")
+    A primeira verificação do token é a mais cara; as seguintes devem
+    ser servidas pelo cache de verificação do servidor. Passa se todas as
+    requisições forem aceitas e a mediana da 2ª em diante for menor que
+    a latência da 1ª. Roda depois da fase paralela, com um token emitido
+    só para ele, para que a 1ª requisição seja de fato a 1ª verificação e
+    a carga dos demais testes não distorça as medidas.
+    """
+    out.append(f"\n♻️  Testando Cache de Verificação JWT ({n} requisições)...")
+    try:
+        # user_id único: o JWT não tem jti, e logins no mesmo segundo geram o mesmo token
+        token_body = orjson.dumps({
+            "user_id": f"jwt_cache_probe_{time.time_ns()}",
+            "role": "admin",
+            "expiration_hours": 1
+        })
+        response = post_json(session, TOKEN_URL, token_body)
+        if response.status_code != 200:
+            out.append(f"    ❌ Emissão do token de teste falhou: HTTP {response.status_code}")
+            return 0, 1
+        headers = {
+            "Authorization": f"Bearer {orjson.loads(response.content)['token']}"
+        }
+        for i in range(n):
+            response = get(session, JWT_LOCK_STATUS_URL, name=JWT_PROBE_NAME, headers=headers)
+            if response.status_code != 200:
+                out.append(f"    ❌ Requisição {i + 1} falhou: HTTP {response.status_code}")
+                return 0, 1
+    except Exception as e:
+        out.append(f"    ❌ Erro no teste de cache JWT: {str(e)}")
+        return 0, 1
+    
+    # Latências já registradas por get(), na ordem das requisições
+    times = LATENCIES[JWT_PROBE_NAME][-n:]
+    first = times[0] / 1e6
+    median = statistics.median(times[1:]) / 1e6
+    out.append(f"    ⏱️  1ª requisição: {first:.2f} ms, mediana das demais: {median:.2f} ms ({first / median:.1f}x)")
+    if median < first:
+        out.append(f"    ✅ Requisições seguintes mais rápidas que a primeira")
+        return 1, 1
+    out.append(f"    ❌ Nenhum ganho após a primeira verificação do token")
+    return 0, 1
+
+TESTS = [
+    test_login_admin,
+    test_login_user,
+    test_login_invalid,
+    test_create_api_key,
+    test_list_api_keys,
+    test_api_key_stats,
+    test_custom_token,
+]
+
+def test_auth_api(session: requests.Session):
+    """Testa a API de autenticação"""
+    print("🔐 Syros - Teste de Autenticação")
     print("=" * 50)
-    print(f"✅ Testes bem-sucedidos: {success_count}/{total_tests}")
-    print(f"📊 Taxa de sucesso: {(success_count/total_tests)*100:.1f}%")
+    
+    # Verificar se o servidor está rodando
+    if not require_server(session):
+        return False
+    
+    # Executar os testes independentes em paralelo, compartilhando a sessão
+    outputs = [[] for _ in TESTS]
+    with ThreadPoolExecutor(max_workers=len(TESTS)) as executor:
+        results = list(executor.map(lambda test, out: test(session, out), TESTS, outputs))
+    
+    # A sonda de cache JWT mede latências: roda sozinha, após a fase paralela
+    probe_out = []
+    results.append(probe_jwt_cache(session, probe_out))
+    outputs.append(probe_out)
+    tests = TESTS + [probe_jwt_cache]
+    
+    # Saída acumulada e escrita de uma vez, em vez de um print por linha
+    log = [line for out in outputs for line in out]
+    
+    # Totais e falhas por teste numa única contagem
+    counts = Counter()
+    for test, (passed, total) in zip(tests, results):
+        counts["pass"] += passed
+        counts["total"] += total
+        counts[test.__name__] = total - passed
+    success_count, total_tests = counts["pass"], counts["total"]
+    rate = success_count / total_tests * 100
+    failed = [test.__name__ for test in tests if counts[test.__name__]]
+    
+    # Resumo final
+    log.append("\n" + "=" * 50)
+    log.append("📋 RESUMO FINAL - AUTENTICAÇÃO")
+    log.append("=" * 50)
+    log.append(f"✅ Testes bem-sucedidos: {success_count}/{total_tests}")
+    log.append(f"📊 Taxa de sucesso: {rate:.1f}%")
+    if failed:
+        log.append(f"❌ Com falhas: {', '.join(failed)}")
     
     if success_count == total_tests:
-        print("🎉 TODOS OS TESTES DE AUTENTICAÇÃO PASSARAM!")
-        print("🔐 Sistema de segurança funcionando perfeitamente!")
+        log.append("🎉 TODOS OS TESTES DE AUTENTICAÇÃO PASSARAM!")
+        log.append("🔐 Sistema de segurança funcionando perfeitamente!")
     elif success_count >= total_tests * 0.8:
-        print("✅ Maioria dos testes passou - sistema de segurança funcional!")
+        log.append("✅ Maioria dos testes passou - sistema de segurança funcional!")
     else:
-        print("⚠️  Alguns testes falharam - verifique a configuração")
+        log.append("⚠️  Alguns testes falharam - verifique a configuração")
+    
+    log.append("\n🔐 Funcionalidades de Segurança Testadas:")
+    log.append("   ✅ Login com JWT")
+    log.append("   ✅ Criação de API Keys")
+    log.append("   ✅ Validação de tokens")
+    log.append("   ✅ Controle de acesso")
+    log.append("   ✅ Estatísticas de uso")
+    
+    log.append("\n👤 Usuários de Teste:")
+    log.append("   - admin/admin123 (role: admin)")
+    log.append("   - user/user123 (role: user)")
     
-    print("\n🔐 Funcionalidades de Segurança Testadas:")
-    print("   ✅ Login com JWT")
-    print("   ✅ Criação de API Keys")
-    print("   ✅ Validação de tokens")
-    print("   ✅ Controle de acesso")
-    print("   ✅ Estatísticas de uso")
+    latency_lines, within_budget = latency_report()
+    log += latency_lines
+    if not within_budget:
+        log.append(f"⚠️  p95 acima de {LATENCY_BUDGET_MS:.0f} ms em algum endpoint")
     
-    print("\n👤 Usuários de Teste:")
-    print("   - admin/admin123 (role: admin)")
-    print("   - user/user123 (role: user)")
+    sys.stdout.write("\n".join(log) + "\n")
     
-    return success_count == total_tests
+    return success_count == total_tests and within_budget
 
 if __name__ == "__main__":
-    success = test_auth_api()
+    # Uma única sessão para todos os testes: a conexão TCP é reaproveitada
+    with SESSION:
+        success = test_auth_api(SESSION)
     exit(0 if success else 1)
@@ -4,18 +4,22 @@ Cliente de teste para Syros
 Demonstra o uso básico da API REST
 """
 
+import orjson
 import requests
-import json
 import time
 
-BASE_URL = "http://localhost:8080"
+from _common import BASE_URL, HEALTH_URL, SESSION
 
-def test_health():
+# Endpoints montados uma única vez
+READY_URL = f"{BASE_URL}/ready"
+LIVE_URL = f"{BASE_URL}/live"
+
+def test_health(session: requests.Session):
     """Testa o endpoint de health"""
     print("🔍 Testando health check...")
-    response = requests.get(f"{BASE_URL}/health")
+    response = session.get(HEALTH_URL)
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         print(f"✅ Status: {data['status']}")
         print(f"📅 Timestamp: {data['timestamp']}")
         print(f"⏱️  Uptime: {data['uptime_seconds']} segundos")
@@ -24,12 +28,12 @@ def test_health():
         print(f"❌ Erro: {response.status_code}")
     print()
 
-def test_readiness():
+def test_readiness(session: requests.Session):
     """Testa o endpoint de readiness"""
     print("🔍 Testando readiness check...")
-    response = requests.get(f"{BASE_URL}/ready")
+    response = session.get(READY_URL)
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         print(f"✅ Ready: {data['ready']}")
         print("📋 Checks:")
         for check in data['checks']:
@@ -39,12 +43,12 @@ def test_readiness():
         print(f"❌ Erro: {response.status_code}")
     print()
 
-def test_liveness():
+def test_liveness(session: requests.Session):
     """Testa o endpoint de liveness"""
     print("🔍 Testando liveness check...")
-    response = requests.get(f"{BASE_URL}/live")
+    response = session.get(LIVE_URL)
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         print(f"✅ Liveness: {data['status']}")
     else:
         print(f"❌ Erro: {response.status_code}")
@@ -56,9 +60,10 @@ def main():
     print("=" * 50)
     
     try:
-        test_health()
-        test_readiness()
-        test_liveness()
+        with SESSION:
+            test_health(SESSION)
+            test_readiness(SESSION)
+            test_liveness(SESSION)
         
         print("🎉 Todos os testes passaram!")
         print("\n📖 Próximos passos:")
@@ -3,131 +3,139 @@
 Teste completo de todas as APIs da Syros
 """
 
+import orjson
 import requests
-import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+import sys
 import time
 
-def test_all_apis():
-    """Testa todas as APIs implementadas"""
-    print("🚀 Syros - Teste Completo de APIs")
-    print("=" * 60)
-    
-    base_url = "http://localhost:8080"
-    
-    # Verificar se o servidor está rodando
-    try:
-        response = requests.get(f"{base_url}/health", timeout=5)
-        if response.status_code != 200:
-            print("❌ Servidor não está rodando!")
-            print("Execute: cargo run -- --verbose")
-            return False
-    except Exception as e:
-        print("❌ Servidor não está rodando!")
-        print("Execute: cargo run -- --verbose")
-        return False
-    
-    success_count = 0
-    total_tests = 0
-    
-    # Teste 1: Health Checks
-    print("\n🏥 Testando Health Checks...")
+from _common import (
+    BASE_URL, HEALTH_URL, LATENCY_BUDGET_MS, SESSION, detail, get, latency_report, post_json,
+    require_server
+)
+
+# Endpoints montados uma única vez
+READY_URL = f"{BASE_URL}/ready"
+LIVE_URL = f"{BASE_URL}/live"
+LOCKS_URL = f"{BASE_URL}/api/v1/locks"
+LOCK_STATUS_URL = f"{BASE_URL}/api/v1/locks/test_resource_complete/status"
+SAGAS_URL = f"{BASE_URL}/api/v1/sagas"
+EVENTS_URL = f"{BASE_URL}/api/v1/events"
+EVENT_STREAM_URL = f"{BASE_URL}/api/v1/events/complete_test_stream"
+CACHE_URL = f"{BASE_URL}/api/v1/cache/test_product_123"
+METRICS_URL = f"{BASE_URL}/metrics"
+
+# Corpos JSON constantes, serializados uma única vez na importação
+LOCK_BODY = orjson.dumps({
+    "key": "test_resource_complete",
+    "owner": "test_client_complete",
+    "ttl_seconds": 60,
+    "metadata": "Complete test lock"
+})
+SAGA_BODY = orjson.dumps({
+    "name": "complete_test_saga",
+    "steps": [
+        {
+            "name": "step1",
+            "action": "create_order",
+            "compensation": "cancel_order"
+        },
+        {
+            "name": "step2",
+            "action": "charge_payment",
+            "compensation": "refund_payment"
+        },
+        {
+            "name": "step3",
+            "action": "send_notification",
+            "compensation": "cancel_notification"
+        }
+    ]
+})
+
+# Os testes abaixo rodam em paralelo: cada um acumula sua saída em `out`
+# (impressa em ordem ao final) e retorna (testes bem-sucedidos, total)
+
+def test_health(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 1: Health Checks"""
+    out.append("\n🏥 Testando Health Checks...")
     health_endpoints = [
-        ("/health", "Health Check"),
-        ("/ready", "Readiness Check"),
-        ("/live", "Liveness Check")
+        (HEALTH_URL, "Health Check"),
+        (READY_URL, "Readiness Check"),
+        (LIVE_URL, "Liveness Check")
     ]
     
-    for endpoint, name in health_endpoints:
-        total_tests += 1
+    success_count = 0
+    for url, name in health_endpoints:
         try:
-            response = requests.get(f"{base_url}{endpoint}")
+            response = get(session, url)
             if response.status_code == 200:
-                result = response.json()
-                print(f"    ✅ {name}: {result['status']}")
+                result = orjson.loads(response.content)
+                out.append(f"    ✅ {name}: {result['status']}")
                 success_count += 1
             else:
-                print(f"    ❌ {name}: HTTP {response.status_code}")
+                out.append(f"    ❌ {name}: HTTP {response.status_code}")
         except Exception as e:
-            print(f"    ❌ {name}: {str(e)}")
+            out.append(f"    ❌ {name}: {str(e)}")
     
-    # Teste 2: Lock API
-    print("\n🔒 Testando Lock API...")
-    total_tests += 1
+    return success_count, len(health_endpoints)
+
+def test_locks(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 2: Lock API"""
+    out.append("\n🔒 Testando Lock API...")
     try:
         # Adquirir lock
-        acquire_data = {
-            "key": "test_resource_complete",
-            "owner": "test_client_complete",
-            "ttl_seconds": 60,
-            "metadata": "Complete test lock"
-        }
-        
-        response = requests.post(f"{base_url}/api/v1/locks", json=acquire_data)
+        response = post_json(session, LOCKS_URL, LOCK_BODY)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             lock_id = result['lock_id']
-            print(f"    ✅ Lock adquirido: {lock_id}")
+            out.append(f"    ✅ Lock adquirido: {lock_id}")
             
             # Verificar status
-            response = requests.get(f"{base_url}/api/v1/locks/test_resource_complete/status")
+            response = get(session, LOCK_STATUS_URL)
             if response.status_code == 200:
-                status = response.json()
-                print(f"    ✅ Status do lock: {status}")
-                success_count += 1
+                status = orjson.loads(response.content)
+                out.append(f"    ✅ Status do lock obtido")
+                detail(out, status)
+                return 1, 1
             else:
-                print(f"    ❌ Falha ao verificar status: HTTP {response.status_code}")
+                out.append(f"    ❌ Falha ao verificar status: HTTP {response.status_code}")
         else:
-            print(f"    ❌ Falha ao adquirir lock: HTTP {response.status_code}")
+            out.append(f"    ❌ Falha ao adquirir lock: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro na Lock API: {str(e)}")
-    
-    # Teste 3: Saga API
-    print("\n🔄 Testando Saga API...")
-    total_tests += 1
+        out.append(f"    ❌ Erro na Lock API: {str(e)}")
+    return 0, 1
+
+def test_sagas(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 3: Saga API"""
+    out.append("\n🔄 Testando Saga API...")
     try:
-        saga_data = {
-            "name": "complete_test_saga",
-            "steps": [
-                {
-                    "name": "step1",
-                    "action": "create_order",
-                    "compensation": "cancel_order"
-                },
-                {
-                    "name": "step2",
-                    "action": "charge_payment",
-                    "compensation": "refund_payment"
-                },
-                {
-                    "name": "step3",
-                    "action": "send_notification",
-                    "compensation": "cancel_notification"
-                }
-            ]
-        }
-        
-        response = requests.post(f"{base_url}/api/v1/sagas", json=saga_data)
+        response = post_json(session, SAGAS_URL, SAGA_BODY)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             saga_id = result['saga_id']
-            print(f"    ✅ Saga iniciada: {saga_id}")
+            out.append(f"    ✅ Saga iniciada: {saga_id}")
             
             # Verificar status
-            response = requests.get(f"{base_url}/api/v1/sagas/{saga_id}/status")
+            response = get(session, f"{SAGAS_URL}/{saga_id}/status", name="GET /api/v1/sagas/{id}/status")
             if response.status_code == 200:
-                status = response.json()
-                print(f"    ✅ Status da saga: {status}")
-                success_count += 1
+                status = orjson.loads(response.content)
+                out.append(f"    ✅ Status da saga obtido")
+                detail(out, status)
+                return 1, 1
             else:
-                print(f"    ❌ Falha ao verificar status: HTTP {response.status_code}")
+                out.append(f"    ❌ Falha ao verificar status: HTTP {response.status_code}")
         else:
-            print(f"    ❌ Falha ao iniciar saga: HTTP {response.status_code}")
+            out.append(f"    ❌ Falha ao iniciar saga: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro na Saga API: {str(e)}")
-    
-    # Teste 4: Event API
-    print("\n📝 Testando Event API...")
-    total_tests += 1
+        out.append(f"    ❌ Erro na Saga API: {str(e)}")
+    return 0, 1
+
+def test_events(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 4: Event API"""
+    out.append("\n📝 Testando Event API...")
     try:
         event_data = {
             "stream_id": "complete_test_stream",
@@ -147,28 +155,29 @@ def test_all_apis():
             }
         }
         
-        response = requests.post(f"{base_url}/api/v1/events", json=event_data)
+        response = post_json(session, EVENTS_URL, event_data)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             event_id = result['event_id']
-            print(f"    ✅ Evento adicionado: {event_id}")
+            out.append(f"    ✅ Evento adicionado: {event_id}")
             
             # Buscar eventos
-            response = requests.get(f"{base_url}/api/v1/events/complete_test_stream")
+            response = get(session, EVENT_STREAM_URL)
             if response.status_code == 200:
-                events = response.json()
-                print(f"    ✅ Eventos recuperados: {len(events['events'])} eventos")
-                success_count += 1
+                events = orjson.loads(response.content)
+                out.append(f"    ✅ Eventos recuperados: {len(events['events'])} eventos")
+                return 1, 1
             else:
-                print(f"    ❌ Falha ao buscar eventos: HTTP {response.status_code}")
+                out.append(f"    ❌ Falha ao buscar eventos: HTTP {response.status_code}")
         else:
-            print(f"    ❌ Falha ao adicionar evento: HTTP {response.status_code}")
+            out.append(f"    ❌ Falha ao adicionar evento: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro na Event API: {str(e)}")
-    
-    # Teste 5: Cache API
-    print("\n💾 Testando Cache API...")
-    total_tests += 1
+        out.append(f"    ❌ Erro na Event API: {str(e)}")
+    return 0, 1
+
+def test_cache(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 5: Cache API"""
+    out.append("\n💾 Testando Cache API...")
     try:
         cache_data = {
             "value": {
@@ -186,37 +195,39 @@ def test_all_apis():
             "tags": ["test", "product", "complete_test"]
         }
         
-        response = requests.post(f"{base_url}/api/v1/cache/test_product_123", json=cache_data)
+        response = post_json(session, CACHE_URL, cache_data)
         if response.status_code == 200:
-            result = response.json()
-            print(f"    ✅ Cache definido: {result['message']}")
+            result = orjson.loads(response.content)
+            out.append(f"    ✅ Cache definido: {result['message']}")
             
             # Buscar cache
-            response = requests.get(f"{base_url}/api/v1/cache/test_product_123")
+            response = get(session, CACHE_URL)
             if response.status_code == 200:
-                cache_result = response.json()
-                print(f"    ✅ Cache recuperado: {cache_result}")
-                success_count += 1
+                cache_result = orjson.loads(response.content)
+                out.append(f"    ✅ Cache recuperado")
+                detail(out, cache_result)
+                return 1, 1
             else:
-                print(f"    ❌ Falha ao buscar cache: HTTP {response.status_code}")
+                out.append(f"    ❌ Falha ao buscar cache: HTTP {response.status_code}")
         else:
-            print(f"    ❌ Falha ao definir cache: HTTP {response.status_code}")
+            out.append(f"    ❌ Falha ao definir cache: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro na Cache API: {str(e)}")
-    
-    # Teste 6: Metrics
-    print("\n📊 Testando Métricas...")
-    total_tests += 1
+        out.append(f"    ❌ Erro na Cache API: {str(e)}")
+    return 0, 1
+
+def test_metrics(session: requests.Session, out: List[str]) -> Tuple[int, int]:
+    """Teste 6: Metrics"""
+    out.append("\n📊 Testando Métricas...")
     try:
-        response = requests.get(f"{base_url}/metrics")
+        response = get(session, METRICS_URL)
         if response.status_code == 200:
             metrics_data = response.text
-            print(f"    ✅ Métricas obtidas: {len(metrics_data)} caracteres")
+            out.append(f"    ✅ Métricas obtidas: {len(metrics_data)} caracteres")
             
             # Verificar se contém métricas esperadas
             expected_metrics = [
                 "locks_acquired_total",
-                "sagas_started_total", 
+                "sagas_started_total",
                 "events_appended_total",
                 "cache_size"
             ]
@@ -226,46 +237,88 @@ def test_all_apis():
                 if metric in metrics_data:
                     found_metrics.append(metric)
             
-            print(f"    ✅ Métricas encontradas: {len(found_metrics)}/{len(expected_metrics)}")
-            print(f"    📈 Métricas: {', '.join(found_metrics)}")
-            success_count += 1
+            out.append(f"    ✅ Métricas encontradas: {len(found_metrics)}/{len(expected_metrics)}")
+            out.append(f"    📈 Métricas: {', '.join(found_metrics)}")
+            return 1, 1
         else:
-            print(f"    ❌ Falha ao obter métricas: HTTP {response.status_code}")
+            out.append(f"    ❌ Falha ao obter métricas: HTTP {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro nas métricas: {str(e)}")
+        out.append(f"    ❌ Erro nas métricas: {str(e)}")
+    return 0, 1
+
+TESTS = [test_health, test_locks, test_sagas, test_events, test_cache, test_metrics]
+
+def test_all_apis(session: requests.Session):
+    """Testa todas as APIs implementadas"""
+    print("🚀 Syros - Teste Completo de APIs")
+    print("=" * 60)
+    
+    # Verificar se o servidor está rodando
+    if not require_server(session):
+        return False
+    
+    # Os testes são independentes entre si: executá-los em paralelo,
+    # compartilhando a sessão (o pool do adapter é thread-safe)
+    outputs = [[] for _ in TESTS]
+    with ThreadPoolExecutor(max_workers=len(TESTS)) as executor:
+        results = list(executor.map(lambda test, out: test(session, out), TESTS, outputs))
+    
+    # Saída acumulada e escrita de uma vez, em vez de um print por linha
+    log = [line for out in outputs for line in out]
+    
+    # Totais e falhas por teste numa única contagem
+    counts = Counter()
+    for test, (passed, total) in zip(TESTS, results):
+        counts["pass"] += passed
+        counts["total"] += total
+        counts[test.__name__] = total - passed
+    success_count, total_tests = counts["pass"], counts["total"]
+    rate = success_count / total_tests * 100
+    failed = [test.__name__ for test in TESTS if counts[test.__name__]]
     
     # Resumo final
-    print("\n" + "=" * 60)
-    print("📋 RESUMO FINAL")
-    print("=" * 60)
-    print(f"✅ Testes bem-sucedidos: {success_count}/{total_tests}")
-    print(f"📊 Taxa de sucesso: {(success_count/total_tests)*100:.1f}%")
+    log.append("\n" + "=" * 60)
+    log.append("📋 RESUMO FINAL")
+    log.append("=" * 60)
+    log.append(f"✅ Testes bem-sucedidos: {success_count}/{total_tests}")
+    log.append(f"📊 Taxa de sucesso: {rate:.1f}%")
+    if failed:
+        log.append(f"❌ Com falhas: {', '.join(failed)}")
     
     if success_count == total_tests:
-        print("🎉 TODOS OS TESTES PASSARAM!")
-        print("🚀 Syros está funcionando perfeitamente!")
+        log.append("🎉 TODOS OS TESTES PASSARAM!")
+        log.append("🚀 Syros está funcionando perfeitamente!")
     elif success_count >= total_tests * 0.8:
-        print("✅ Maioria dos testes passou - plataforma funcional!")
+        log.append("✅ Maioria dos testes passou - plataforma funcional!")
     else:
-        print("⚠️  Alguns testes falharam - verifique a configuração")
+        log.append("⚠️  Alguns testes falharam - verifique a configuração")
+    
+    log.append("\n🔗 APIs Testadas:")
+    log.append("   ✅ Health Checks (/health, /ready, /live)")
+    log.append("   ✅ Lock API (/api/v1/locks/*)")
+    log.append("   ✅ Saga API (/api/v1/sagas/*)")
+    log.append("   ✅ Event API (/api/v1/events/*)")
+    log.append("   ✅ Cache API (/api/v1/cache/*)")
+    log.append("   ✅ Metrics (/metrics)")
+    
+    log.append("\n📦 SDKs Disponíveis:")
+    log.append("   ✅ Python SDK (completo)")
+    log.append("   ✅ Node.js SDK (completo)")
+    log.append("   ✅ Java SDK (completo)")
+    log.append("   ✅ C# SDK (completo)")
+    log.append("   ✅ Go SDK (completo)")
     
-    print("\n🔗 APIs Testadas:")
-    print("   ✅ Health Checks (/health, /ready, /live)")
-    print("   ✅ Lock API (/api/v1/locks/*)")
-    print("   ✅ Saga API (/api/v1/sagas/*)")
-    print("   ✅ Event API (/api/v1/events/*)")
-    print("   ✅ Cache API (/api/v1/cache/*)")
-    print("   ✅ Metrics (/metrics)")
+    latency_lines, within_budget = latency_report()
+    log += latency_lines
+    if not within_budget:
+        log.append(f"⚠️  p95 acima de {LATENCY_BUDGET_MS:.0f} ms em algum endpoint")
     
-    print("\n📦 SDKs Disponíveis:")
-    print("   ✅ Python SDK (completo)")
-    print("   ✅ Node.js SDK (completo)")
-    print("   ✅ Java SDK (completo)")
-    print("   ✅ C# SDK (completo)")
-    print("   ✅ Go SDK (completo)")
+    sys.stdout.write("\n".join(log) + "\n")
     
-    return success_count == total_tests
+    return success_count == total_tests and within_budget
 
 if __name__ == "__main__":
-    success = test_all_apis()
+    # Uma única sessão para todos os testes: a conexão TCP é reaproveitada
+    with SESSION:
+        success = test_all_apis(SESSION)
     exit(0 if success else 1)
@@ -3,18 +3,45 @@
 Teste das novas APIs da Syros
 """
 
-import requests
 import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
-def test_lock_api():
+import orjson
+import requests.models
+
+from _common import SESSION, require_server
+
+class _OrjsonShim:
+    """Substitui o json da stdlib usado por `requests` (.json() e json=)"""
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # requests espera str; opções do json da stdlib (allow_nan...) são ignoradas
+        return orjson.dumps(obj).decode()
+
+requests.models.complexjson = _OrjsonShim
+
+# Amostras das métricas verificadas, encontradas numa única passada sobre o corpo
+METRICS_RE = re.compile(rb"^(locks_acquired_total|sagas_started_total)\b", re.MULTILINE)
+
+# Os grupos de teste rodam em paralelo sobre a mesma sessão: cada um
+# acumula sua saída em `out`, impressa em ordem ao final
+
+def test_lock_api(out: List[str]):
     """Testa a API de locks"""
-    print("🔒 Testando API de Locks...")
+    out.append("🔒 Testando API de Locks...")
     
     base_url = "http://localhost:8080"
     
     # Teste 1: Adquirir lock
-    print("  📝 Adquirindo lock...")
+    out.append("  📝 Adquirindo lock...")
     acquire_data = {
         "key": "test_resource_1",
         "owner": "test_client",
@@ -23,55 +50,55 @@ def test_lock_api():
     }
     
     try:
-        response = requests.post(f"{base_url}/api/v1/locks", json=acquire_data)
+        response = SESSION.post(f"{base_url}/api/v1/locks", json=acquire_data)
         if response.status_code == 200:
             result = response.json()
-            print(f"    ✅ Lock adquirido: {result['lock_id']}")
+            out.append(f"    ✅ Lock adquirido: {result['lock_id']}")
             lock_id = result['lock_id']
         else:
-            print(f"    ❌ Falha ao adquirir lock: {response.status_code}")
+            out.append(f"    ❌ Falha ao adquirir lock: {response.status_code}")
             return
     except Exception as e:
-        print(f"    ❌ Erro ao adquirir lock: {str(e)}")
+        out.append(f"    ❌ Erro ao adquirir lock: {str(e)}")
         return
     
     # Teste 2: Verificar status do lock
-    print("  📊 Verificando status do lock...")
+    out.append("  📊 Verificando status do lock...")
     try:
-        response = requests.get(f"{base_url}/api/v1/locks/test_resource_1/status")
+        response = SESSION.get(f"{base_url}/api/v1/locks/test_resource_1/status")
         if response.status_code == 200:
             result = response.json()
-            print(f"    ✅ Status: {result}")
+            out.append(f"    ✅ Status: {result}")
         else:
-            print(f"    ❌ Falha ao verificar status: {response.status_code}")
+            out.append(f"    ❌ Falha ao verificar status: {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro ao verificar status: {str(e)}")
+        out.append(f"    ❌ Erro ao verificar status: {str(e)}")
     
     # Teste 3: Liberar lock
-    print("  🔓 Liberando lock...")
+    out.append("  🔓 Liberando lock...")
     release_data = {
         "lock_id": lock_id,
         "owner": "test_client"
     }
     
     try:
-        response = requests.delete(f"{base_url}/api/v1/locks/test_resource_1", json=release_data)
+        response = SESSION.delete(f"{base_url}/api/v1/locks/test_resource_1", json=release_data)
         if response.status_code == 200:
             result = response.json()
-            print(f"    ✅ Lock liberado: {result['message']}")
+            out.append(f"    ✅ Lock liberado: {result['message']}")
         else:
-            print(f"    ❌ Falha ao liberar lock: {response.status_code}")
+            out.append(f"    ❌ Falha ao liberar lock: {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro ao liberar lock: {str(e)}")
+        out.append(f"    ❌ Erro ao liberar lock: {str(e)}")
 
-def test_saga_api():
+def test_saga_api(out: List[str]):
     """Testa a API de sagas"""
-    print("\n🔄 Testando API de Sagas...")
+    out.append("\n🔄 Testando API de Sagas...")
     
     base_url = "http://localhost:8080"
     
     # Teste 1: Iniciar saga
-    print("  🚀 Iniciando saga...")
+    out.append("  🚀 Iniciando saga...")
     saga_data = {
         "name": "test_saga",
         "steps": [
@@ -89,62 +116,62 @@ def test_saga_api():
     }
     
     try:
-        response = requests.post(f"{base_url}/api/v1/sagas", json=saga_data)
+        response = SESSION.post(f"{base_url}/api/v1/sagas", json=saga_data)
         if response.status_code == 200:
             result = response.json()
-            print(f"    ✅ Saga iniciada: {result['saga_id']}")
+            out.append(f"    ✅ Saga iniciada: {result['saga_id']}")
             saga_id = result['saga_id']
         else:
-            print(f"    ❌ Falha ao iniciar saga: {response.status_code}")
+            out.append(f"    ❌ Falha ao iniciar saga: {response.status_code}")
             return
     except Exception as e:
-        print(f"    ❌ Erro ao iniciar saga: {str(e)}")
+        out.append(f"    ❌ Erro ao iniciar saga: {str(e)}")
         return
     
     # Teste 2: Verificar status da saga
-    print("  📊 Verificando status da saga...")
+    out.append("  📊 Verificando status da saga...")
     try:
-        response = requests.get(f"{base_url}/api/v1/sagas/{saga_id}/status")
+        response = SESSION.get(f"{base_url}/api/v1/sagas/{saga_id}/status")
         if response.status_code == 200:
             result = response.json()
-            print(f"    ✅ Status da saga: {result}")
+            out.append(f"    ✅ Status da saga: {result}")
         else:
-            print(f"    ❌ Falha ao verificar status: {response.status_code}")
+            out.append(f"    ❌ Falha ao verificar status: {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro ao verificar status: {str(e)}")
+        out.append(f"    ❌ Erro ao verificar status: {str(e)}")
 
-def test_metrics():
+def test_metrics(out: List[str]):
     """Testa o endpoint de métricas"""
-    print("\n📊 Testando Métricas...")
+    out.append("\n📊 Testando Métricas...")
     
     base_url = "http://localhost:8080"
     
     try:
-        response = requests.get(f"{base_url}/metrics")
+        response = SESSION.get(f"{base_url}/metrics")
         if response.status_code == 200:
-            metrics_data = response.text
-            print("    ✅ Métricas obtidas com sucesso!")
+            out.append("    ✅ Métricas obtidas com sucesso!")
             
             # Verificar se contém métricas de locks e sagas
-            if "locks_acquired_total" in metrics_data:
-                print("    ✅ Métricas de locks encontradas")
-            if "sagas_started_total" in metrics_data:
-                print("    ✅ Métricas de sagas encontradas")
+            hits = set(METRICS_RE.findall(response.content))
+            if b"locks_acquired_total" in hits:
+                out.append("    ✅ Métricas de locks encontradas")
+            if b"sagas_started_total" in hits:
+                out.append("    ✅ Métricas de sagas encontradas")
                 
-            # Mostrar algumas métricas
-            lines = metrics_data.split('\n')
-            print("    📈 Algumas métricas:")
-            for line in lines[:10]:
+            # Mostrar algumas métricas (só as primeiras linhas são separadas)
+            lines = response.text.split('\n', 10)[:10]
+            out.append("    📈 Algumas métricas:")
+            for line in lines:
                 if line and not line.startswith('#'):
-                    print(f"      {line}")
+                    out.append(f"      {line}")
         else:
-            print(f"    ❌ Falha ao obter métricas: {response.status_code}")
+            out.append(f"    ❌ Falha ao obter métricas: {response.status_code}")
     except Exception as e:
-        print(f"    ❌ Erro ao obter métricas: {str(e)}")
+        out.append(f"    ❌ Erro ao obter métricas: {str(e)}")
 
-def test_health():
+def test_health(out: List[str]):
     """Testa os health checks"""
-    print("\n🏥 Testando Health Checks...")
+    out.append("\n🏥 Testando Health Checks...")
     
     base_url = "http://localhost:8080"
     
@@ -156,14 +183,16 @@ def test_health():
     
     for endpoint, name in endpoints:
         try:
-            response = requests.get(f"{base_url}{endpoint}")
+            response = SESSION.get(f"{base_url}{endpoint}")
             if response.status_code == 200:
                 result = response.json()
-                print(f"    ✅ {name}: {result['status']}")
+                out.append(f"    ✅ {name}: {result['status']}")
             else:
-                print(f"    ❌ {name}: {response.status_code}")
+                out.append(f"    ❌ {name}: {response.status_code}")
         except Exception as e:
-            print(f"    ❌ {name}: {str(e)}")
+            out.append(f"    ❌ {name}: {str(e)}")
+
+TESTS = [test_health, test_lock_api, test_saga_api, test_metrics]
 
 def main():
     """Executa todos os testes"""
@@ -171,21 +200,15 @@ def main():
     print("=" * 50)
     
     # Verificar se o servidor está rodando
-    try:
-        response = requests.get("http://localhost:8080/health", timeout=5)
-        if response.status_code != 200:
-            print("❌ Servidor não está rodando!")
-            print("Execute: cargo run -- --verbose")
-            return
-    except Exception as e:
-        print("❌ Servidor não está rodando!")
-        print("Execute: cargo run -- --verbose")
+    if not require_server():
         return
     
-    test_health()
-    test_lock_api()
-    test_saga_api()
-    test_metrics()
+    # Grupos independentes: executá-los em paralelo (o pool da sessão é thread-safe)
+    outputs = [[] for _ in TESTS]
+    with ThreadPoolExecutor(max_workers=len(TESTS)) as executor:
+        list(executor.map(lambda test, out: test(out), TESTS, outputs))
+    for out in outputs:
+        print("\n".join(out))
     
     print("\n" + "=" * 50)
     print("✅ Testes das novas APIs concluídos!")
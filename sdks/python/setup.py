@@ -47,6 +47,13 @@ setup(
             "mypy>=0.991",
             "flake8>=5.0.0",
         ],
+        "fast": [
+            'uvloop>=0.19; platform_system != "Windows"',
+            "zstandard>=0.21.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
         "docs": [
             "sphinx>=5.0.0",
             "sphinx-rtd-theme>=1.0.0",
@@ -4,16 +4,127 @@ SDK oficial para integração com a Syros
 """
 
 import asyncio
-import json
+import logging
+import random
+import sys
 import time
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict, deque
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Iterable, Tuple
 import aiohttp
+import orjson
+from multidict import CIMultiDict
 import websockets
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+try:
+    # Backend HTTP/2 opcional: pip install syros-sdk[http2]
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    # Descompressão zstd opcional: pip install syros-sdk[fast]
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def install_uvloop() -> bool:
+    """Usa o uvloop como event loop do asyncio, se estiver instalado
+    
+    Chamar uma vez, antes de `asyncio.run`; afeta o processo inteiro.
+    Retorna False se o uvloop não estiver disponível (pip install
+    syros-sdk[fast]).
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+# Com zstandard instalado, a sessão aiohttp pede apenas zstd e desliga a
+# descompressão automática (cujo suporte a zstd depende da versão e de
+# outros pacotes): o Content-Encoding recebido é então fiel ao corpo e a
+# descompressão fica a cargo do SDK. O httpx negocia e decodifica zstd
+# sozinho quando o zstandard está disponível.
+_ZSTD = zstandard is not None
+
+
+def _zstd_decompressor(response: aiohttp.ClientResponse) -> Optional[Any]:
+    if _ZSTD and response.headers.get("Content-Encoding") == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj()
+    return None
+
+
+async def _read_body(response: aiohttp.ClientResponse) -> bytes:
+    body = await response.read()
+    decompressor = _zstd_decompressor(response)
+    return decompressor.decompress(body) if decompressor else body
+
+
+async def _iter_ndjson(response: aiohttp.ClientResponse) -> AsyncIterator[Any]:
+    """Decodifica um corpo NDJSON em streaming, descomprimindo se preciso"""
+    decompressor = _zstd_decompressor(response)
+    buffer = b""
+    async for chunk in response.content.iter_any():
+        buffer += decompressor.decompress(chunk) if decompressor else chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield orjson.loads(line)
+    if buffer.strip():
+        yield orjson.loads(buffer)
+
+
+# Negociação de streaming de eventos: um JSON por linha
+_NDJSON = "application/x-ndjson"
+_NDJSON_HEADERS = {"Accept": _NDJSON}
+
+# __slots__ nos dataclasses (menos memória por instância) a partir do Python 3.10
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+class _TTLCache:
+    """Cache LRU em memória com expiração por entrada (ttl <= 0 desativa)
+    
+    Os valores são guardados serializados e decodificados a cada acerto:
+    quem altera o resultado recebido não corrompe os acertos seguintes.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+    
+    def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return orjson.loads(value)
+    
+    def set(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, orjson.dumps(value))
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class LockRequest:
     key: str
     owner: str
@@ -22,14 +133,14 @@ class LockRequest:
     wait_timeout_seconds: Optional[int] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LockResponse:
     lock_id: str
     success: bool
     message: str
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SagaStep:
     name: str
     action: str
@@ -39,21 +150,31 @@ class SagaStep:
     payload: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class SagaRequest:
     name: str
     steps: List[SagaStep]
     metadata: Optional[Dict[str, str]] = None
+    _body: bytes = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # A requisição é imutável: o corpo JSON é montado uma única vez e
+        # reutilizado a cada envio (não altere steps/metadata depois)
+        object.__setattr__(self, "_body", orjson.dumps({
+            "name": self.name,
+            "steps": self.steps,
+            "metadata": self.metadata,
+        }))
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SagaResponse:
     saga_id: str
     status: str
     message: str
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class EventRequest:
     stream_id: str
     event_type: str
@@ -61,7 +182,7 @@ class EventRequest:
     metadata: Optional[Dict[str, str]] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class EventResponse:
     event_id: str
     version: int
@@ -69,7 +190,7 @@ class EventResponse:
     message: str
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CacheRequest:
     key: str
     value: Dict[str, Any]
@@ -77,233 +198,473 @@ class CacheRequest:
     tags: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CacheResponse:
     key: str
     value: Dict[str, Any]
-    expires_at: Optional[str] = None
     tags: List[str]
     success: bool
     message: str
+    expires_at: Optional[str] = None
 
 
 class SyrosClient:
-    """Cliente principal para a Syros"""
+    """Cliente principal para a Syros
+    
+    Todas as chamadas compartilham uma única sessão HTTP (e seu pool de
+    conexões keep-alive), criada na primeira chamada ou no `async with`.
+    
+    Com `ttl` > 0, leituras de status de lock/saga e de cache são
+    reaproveitadas por até `ttl` segundos; o padrão (0) sempre consulta
+    o servidor.
     
-    def __init__(self, endpoint: str = "http://localhost:8080", api_key: Optional[str] = None):
+    Com `use_http2=True` as chamadas passam por um `httpx.AsyncClient`
+    com HTTP/2, multiplexando requisições concorrentes numa só conexão
+    (requer `pip install syros-sdk[http2]` e um servidor ou proxy que
+    negocie h2; caso contrário o httpx usa HTTP/1.1).
+    
+    Com `throttle_threshold` > 0, quando `acquire_lock`/`append_event`
+    falham mais que isso no último segundo (erro de rede ou resposta 5xx),
+    as chamadas seguintes esperam `throttle_base` segundos por falha
+    recente antes de ir ao servidor, aliviando-o em vez de somar
+    retentativas. O padrão (0) não limita.
+    
+    Recomendado: instalar o extra `fast` e chamar `install_uvloop()` antes
+    de `asyncio.run`; o event loop do uvloop acelera cargas de muitas
+    requisições pequenas.
+    
+    Chamadas independentes entre si podem ser sobrepostas com
+    `asyncio.gather` (ou `batch`, que limita quantas ficam em voo), pagando
+    uma latência de rede em vez de uma por chamada.
+    """
+    
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:8080",
+        api_key: Optional[str] = None,
+        max_connections: int = 100,
+        keepalive_timeout: float = 30.0,
+        ttl: float = 0.0,
+        use_http2: bool = False,
+        throttle_threshold: float = 0.0,
+        throttle_base: float = 0.01,
+    ):
+        if use_http2 and httpx is None:
+            raise ImportError("use_http2 requer httpx: pip install syros-sdk[http2]")
         self.endpoint = endpoint.rstrip('/')
         self.api_key = api_key
+        # URLs base e cabeçalhos montados uma única vez, fora do caminho quente
+        self._url_health = f"{self.endpoint}/health"
+        self._url_locks = f"{self.endpoint}/api/v1/locks"
+        self._url_sagas = f"{self.endpoint}/api/v1/sagas"
+        self._url_events = f"{self.endpoint}/api/v1/events"
+        self._url_cache = f"{self.endpoint}/api/v1/cache"
+        self._url_events_batch = f"{self._url_events}/batch"
+        # Já no formato interno do aiohttp, que não precisa reconvertê-los
+        self._headers: CIMultiDict = CIMultiDict([("Content-Type", "application/json")])
+        if api_key:
+            self._headers.add("Authorization", f"Bearer {api_key}")
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.use_http2 = use_http2
         self.session: Optional[aiohttp.ClientSession] = None
+        self._http2_client = None
+        # Event loop em que a sessão/cliente atual foi criado
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock_status_cache = _TTLCache(maxsize=4096, ttl=ttl)
+        self._saga_status_cache = _TTLCache(maxsize=4096, ttl=ttl)
+        self._cache_get_cache = _TTLCache(maxsize=4096, ttl=ttl)
+        self.throttle_threshold = throttle_threshold
+        self.throttle_base = throttle_base
+        self._failure_window: "deque[float]" = deque(maxlen=128)
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._event_flusher: Optional["asyncio.Future[None]"] = None
+        self._event_batch_supported = True
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self.use_http2:
+            self._get_http2_client()
+        else:
+            self._get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def close(self):
+        """Fecha a sessão HTTP e suas conexões"""
+        if self._event_flusher is not None:
+            # Envia os eventos ainda enfileirados antes de encerrar
+            await self._event_queue.join()
+            self._event_flusher.cancel()
+            self._event_flusher = None
+            self._event_queue = None
         if self.session:
             await self.session.close()
+            self.session = None
+        if self._http2_client is not None:
+            await self._http2_client.aclose()
+            self._http2_client = None
+    
+    def _loop_changed(self) -> bool:
+        # Sessões ficam presas ao loop em que foram criadas: após um novo
+        # asyncio.run a anterior (de um loop já encerrado) é descartada
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return False
+        self._loop = loop
+        return True
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._loop_changed() or self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True,
+                ttl_dns_cache=300,
+            )
+            headers = self._headers
+            if _ZSTD:
+                headers = self._headers.copy()
+                headers["Accept-Encoding"] = "zstd"
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=headers,
+                auto_decompress=not _ZSTD,
+            )
+        return self.session
+    
+    def _get_http2_client(self) -> "httpx.AsyncClient":
+        if self._loop_changed() or self._http2_client is None or self._http2_client.is_closed:
+            self._http2_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=self.keepalive_timeout,
+                ),
+                timeout=30.0,
+                headers=self._headers,
+            )
+        return self._http2_client
+    
+    async def batch(self, coros: Iterable[Awaitable[Any]], max_inflight: Optional[int] = None) -> List[Any]:
+        """Executa chamadas independentes em paralelo, na ordem dada
+        
+        No máximo `max_inflight` (padrão: `max_connections`) ficam em voo
+        ao mesmo tempo, para não disputar conexões do pool.
+        """
+        semaphore = asyncio.Semaphore(max_inflight or self.max_connections)
+        
+        async def bounded(coro: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await coro
+        
+        return await asyncio.gather(*(bounded(coro) for coro in coros))
     
-    def _get_headers(self) -> Dict[str, str]:
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
+    async def _send(self, method: str, url: str, body: Optional[bytes] = None) -> Tuple[int, bytes]:
+        """Envia a requisição pelo backend configurado; retorna (status, corpo)"""
+        if self.use_http2:
+            response = await self._get_http2_client().request(method, url, content=body)
+            return response.status_code, response.content
+        # Sem o context manager por chamada: a conexão volta ao pool no release()
+        response = await self._get_session().request(method, url, data=body)
+        try:
+            return response.status, await _read_body(response)
+        finally:
+            response.release()
+    
+    async def _request(self, method: str, url: str, body: Optional[bytes] = None) -> Any:
+        """Envia a requisição e decodifica o JSON da resposta"""
+        _, payload = await self._send(method, url, body)
+        return orjson.loads(payload)
+    
+    async def _throttled_send(self, method: str, url: str, body: Optional[bytes] = None) -> Tuple[int, bytes]:
+        """Como `_send`, registrando falhas e recuando se estiverem frequentes
+        
+        Só contam como falha erros de rede e respostas 5xx; `success=False`
+        (ex.: lock ocupado) é uma resposta normal e não ativa o recuo.
+        """
+        if self.throttle_threshold > 0 and self._failure_window:
+            now = time.monotonic()
+            failure_rate = sum(1 for t in self._failure_window if now - t < 1.0)
+            if failure_rate > self.throttle_threshold:
+                delay = self.throttle_base * failure_rate
+                logger.warning(
+                    "Syros sob pressão (%d falhas/s): aguardando %.3fs", failure_rate, delay
+                )
+                await asyncio.sleep(delay)
+        
+        try:
+            status, payload = await self._send(method, url, body)
+        except Exception:
+            self._failure_window.append(time.monotonic())
+            raise
+        if status >= 500:
+            self._failure_window.append(time.monotonic())
+        return status, payload
+    
+    async def _throttled_request(self, method: str, url: str, body: Optional[bytes] = None) -> Any:
+        _, payload = await self._throttled_send(method, url, body)
+        return orjson.loads(payload)
     
     async def health_check(self) -> Dict[str, Any]:
         """Verifica a saúde da plataforma"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        async with self.session.get(f"{self.endpoint}/health") as response:
-            return await response.json()
+        return await self._request("GET", self._url_health)
     
     async def acquire_lock(self, request: LockRequest) -> LockResponse:
         """Adquire um lock distribuído"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        data = {
-            "key": request.key,
-            "owner": request.owner,
-            "ttl_seconds": request.ttl_seconds,
-            "metadata": request.metadata,
-            "wait_timeout_seconds": request.wait_timeout_seconds,
-        }
+        result = await self._throttled_request("POST", self._url_locks, orjson.dumps(request))
+        self._lock_status_cache.pop(request.key)
+        return LockResponse(
+            lock_id=result.get("lock_id", ""),
+            success=result.get("success", False),
+            message=result.get("message", "")
+        )
+    
+    async def acquire_lock_with_retry(
+        self,
+        request: LockRequest,
+        retries: int = 5,
+        base_delay: float = 0.01,
+        max_delay: float = 1.0,
+    ) -> LockResponse:
+        """Adquire um lock, repetindo com backoff exponencial e jitter
         
-        async with self.session.post(
-            f"{self.endpoint}/api/v1/locks",
-            json=data,
-            headers=self._get_headers()
-        ) as response:
-            result = await response.json()
-            return LockResponse(
-                lock_id=result.get("lock_id", ""),
-                success=result.get("success", False),
-                message=result.get("message", "")
-            )
+        Entre tentativas espera um tempo aleatório em
+        [0, min(max_delay, base_delay * 2**n)], n = 0, 1, ... ("full jitter"), para
+        que clientes disputando o mesmo lock não tentem em sincronia.
+        Retorna a última resposta caso nenhuma tentativa tenha sucesso.
+        """
+        response = await self.acquire_lock(request)
+        for attempt in range(1, retries):
+            if response.success:
+                break
+            await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))))
+            response = await self.acquire_lock(request)
+        return response
     
     async def release_lock(self, key: str) -> Dict[str, Any]:
         """Libera um lock distribuído"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        async with self.session.delete(
-            f"{self.endpoint}/api/v1/locks/{key}",
-            headers=self._get_headers()
-        ) as response:
-            return await response.json()
+        result = await self._request("DELETE", f"{self._url_locks}/{key}")
+        self._lock_status_cache.pop(key)
+        return result
     
     async def get_lock_status(self, key: str) -> Dict[str, Any]:
         """Obtém o status de um lock"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        async with self.session.get(
-            f"{self.endpoint}/api/v1/locks/{key}/status",
-            headers=self._get_headers()
-        ) as response:
-            return await response.json()
+        cached = self._lock_status_cache.get(key)
+        if cached is not None:
+            return cached
+        result = await self._request("GET", f"{self._url_locks}/{key}/status")
+        self._lock_status_cache.set(key, result)
+        return result
     
     async def start_saga(self, request: SagaRequest) -> SagaResponse:
         """Inicia uma saga"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        data = {
-            "name": request.name,
-            "steps": [
-                {
-                    "name": step.name,
-                    "action": step.action,
-                    "compensation": step.compensation,
-                    "timeout_seconds": step.timeout_seconds,
-                    "retry_policy": step.retry_policy,
-                    "payload": step.payload,
-                }
-                for step in request.steps
-            ],
-            "metadata": request.metadata,
-        }
-        
-        async with self.session.post(
-            f"{self.endpoint}/api/v1/sagas",
-            json=data,
-            headers=self._get_headers()
-        ) as response:
-            result = await response.json()
-            return SagaResponse(
-                saga_id=result.get("saga_id", ""),
-                status=result.get("status", ""),
-                message=result.get("message", "")
-            )
+        result = await self._request("POST", self._url_sagas, request._body)
+        return SagaResponse(
+            saga_id=result.get("saga_id", ""),
+            status=result.get("status", ""),
+            message=result.get("message", "")
+        )
     
     async def get_saga_status(self, saga_id: str) -> Dict[str, Any]:
         """Obtém o status de uma saga"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
+        cached = self._saga_status_cache.get(saga_id)
+        if cached is not None:
+            return cached
+        result = await self._request("GET", f"{self._url_sagas}/{saga_id}/status")
+        self._saga_status_cache.set(saga_id, result)
+        return result
+    
+    def enable_event_batching(self, max_batch: int = 256, max_delay_ms: float = 5) -> None:
+        """Agrupa chamadas de `append_event` em envios de até `max_batch` eventos
+        
+        Uma tarefa de fundo junta os eventos que chegarem em até
+        `max_delay_ms` e os envia num único POST a /api/v1/events/batch,
+        que responde uma lista de resultados na mesma ordem. Se o servidor
+        não tiver esse endpoint (404/405), os eventos do lote passam a ser
+        enviados individualmente, em paralelo. Deve ser chamado com o event
+        loop rodando; `close()` envia o que estiver pendente.
+        """
+        if self._event_flusher is not None:
+            return
+        self._event_queue = asyncio.Queue()
+        self._event_flusher = asyncio.ensure_future(
+            self._flush_events(self._event_queue, max_batch, max_delay_ms / 1000)
+        )
+    
+    async def _flush_events(self, queue: asyncio.Queue, max_batch: int, max_delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + max_delay
+            while len(batch) < max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
             
-        async with self.session.get(
-            f"{self.endpoint}/api/v1/sagas/{saga_id}/status",
-            headers=self._get_headers()
-        ) as response:
-            return await response.json()
+            try:
+                results = await self._post_event_batch([request for request, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                queue.task_done()
+    
+    async def _post_event_batch(self, requests: List[EventRequest]) -> List[Any]:
+        if self._event_batch_supported:
+            status, payload = await self._throttled_send(
+                "POST", self._url_events_batch, orjson.dumps(requests)
+            )
+            if status not in (404, 405):
+                results = orjson.loads(payload)
+                if not isinstance(results, list):
+                    # Erro do lote inteiro (objeto em vez de lista) vale para todos
+                    return [results] * len(requests)
+                if len(results) != len(requests):
+                    raise RuntimeError(
+                        f"Lote de {len(requests)} eventos respondido com {len(results)} resultados"
+                    )
+                return results
+            self._event_batch_supported = False
+        
+        return await asyncio.gather(
+            *(
+                self._throttled_request("POST", self._url_events, orjson.dumps(request))
+                for request in requests
+            ),
+            return_exceptions=True,
+        )
     
     async def append_event(self, request: EventRequest) -> EventResponse:
         """Adiciona um evento ao event store"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        data = {
-            "stream_id": request.stream_id,
-            "event_type": request.event_type,
-            "data": request.data,
-            "metadata": request.metadata,
-        }
-        
-        async with self.session.post(
-            f"{self.endpoint}/api/v1/events",
-            json=data,
-            headers=self._get_headers()
-        ) as response:
-            result = await response.json()
-            return EventResponse(
-                event_id=result.get("event_id", ""),
-                version=result.get("version", 0),
-                success=result.get("success", False),
-                message=result.get("message", "")
-            )
+        if self._event_queue is not None:
+            future = asyncio.get_running_loop().create_future()
+            await self._event_queue.put((request, future))
+            result = await future
+        else:
+            result = await self._throttled_request("POST", self._url_events, orjson.dumps(request))
+        return EventResponse(
+            event_id=result.get("event_id", ""),
+            version=result.get("version", 0),
+            success=result.get("success", False),
+            message=result.get("message", "")
+        )
     
-    async def get_events(self, stream_id: str, from_version: Optional[int] = None) -> Dict[str, Any]:
-        """Obtém eventos de um stream"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        url = f"{self.endpoint}/api/v1/events/{stream_id}"
+    def _events_url(self, stream_id: str, from_version: Optional[int]) -> str:
+        url = f"{self._url_events}/{stream_id}"
         if from_version is not None:
             url += f"?from_version={from_version}"
-            
-        async with self.session.get(url, headers=self._get_headers()) as response:
-            return await response.json()
+        return url
+    
+    async def get_events(self, stream_id: str, from_version: Optional[int] = None) -> Dict[str, Any]:
+        """Obtém eventos de um stream"""
+        return await self._request("GET", self._events_url(stream_id, from_version))
+    
+    async def stream_events(
+        self, stream_id: str, from_version: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Itera os eventos de um stream à medida que chegam
+        
+        Pede `Accept: application/x-ndjson` (um evento por linha), com
+        memória constante em replays longos. Servidores que ignoram o
+        cabeçalho respondem o JSON completo de `get_events`; nesse caso os
+        eventos são lidos de `events` de uma só vez.
+        """
+        url = self._events_url(stream_id, from_version)
+        
+        if self.use_http2:
+            async with self._get_http2_client().stream("GET", url, headers=_NDJSON_HEADERS) as response:
+                if response.headers.get("Content-Type", "").startswith(_NDJSON):
+                    async for line in response.aiter_lines():
+                        if line.strip():
+                            yield orjson.loads(line)
+                    return
+                body = await response.aread()
+        else:
+            async with self._get_session().get(url, headers=_NDJSON_HEADERS) as response:
+                if response.headers.get("Content-Type", "").startswith(_NDJSON):
+                    async for event in _iter_ndjson(response):
+                        yield event
+                    return
+                body = await _read_body(response)
+        
+        for event in orjson.loads(body).get("events", []):
+            yield event
     
     async def set_cache(self, request: CacheRequest) -> CacheResponse:
         """Define um valor no cache"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        data = {
-            "value": request.value,
-            "ttl_seconds": request.ttl_seconds,
-            "tags": request.tags or [],
-        }
-        
-        async with self.session.post(
-            f"{self.endpoint}/api/v1/cache/{request.key}",
-            json=data,
-            headers=self._get_headers()
-        ) as response:
-            result = await response.json()
-            return CacheResponse(
-                key=result.get("key", request.key),
-                value=result.get("value", {}),
-                expires_at=result.get("expires_at"),
-                tags=result.get("tags", []),
-                success=result.get("success", False),
-                message=result.get("message", "")
-            )
+        result = await self._request("POST", f"{self._url_cache}/{request.key}", orjson.dumps(request))
+        self._cache_get_cache.pop(request.key)
+        return CacheResponse(
+            key=result.get("key", request.key),
+            value=result.get("value", {}),
+            expires_at=result.get("expires_at"),
+            tags=result.get("tags", []),
+            success=result.get("success", False),
+            message=result.get("message", "")
+        )
     
     async def get_cache(self, key: str) -> Dict[str, Any]:
         """Obtém um valor do cache"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        async with self.session.get(
-            f"{self.endpoint}/api/v1/cache/{key}",
-            headers=self._get_headers()
-        ) as response:
-            return await response.json()
+        cached = self._cache_get_cache.get(key)
+        if cached is not None:
+            return cached
+        result = await self._request("GET", f"{self._url_cache}/{key}")
+        self._cache_get_cache.set(key, result)
+        return result
     
     async def delete_cache(self, key: str) -> Dict[str, Any]:
         """Remove um valor do cache"""
-        if not self.session:
-            raise RuntimeError("Cliente não inicializado. Use 'async with SyrosClient()'")
-            
-        async with self.session.delete(
-            f"{self.endpoint}/api/v1/cache/{key}",
-            headers=self._get_headers()
-        ) as response:
-            return await response.json()
+        result = await self._request("DELETE", f"{self._url_cache}/{key}")
+        self._cache_get_cache.pop(key)
+        return result
+
+
+# Acima deste tamanho (em caracteres/bytes) a decodificação vai para uma thread
+_OFFLOAD_DECODE_SIZE = 64 * 1024
 
 
 class SyrosWebSocketClient:
-    """Cliente WebSocket para eventos em tempo real"""
+    """Cliente WebSocket para eventos em tempo real
+    
+    A compressão permessage-deflate vem desativada: para as mensagens
+    JSON pequenas do protocolo, em rede local, o custo de CPU do zlib
+    supera a economia de banda. Em links WAN lentos, use
+    `compression="deflate"`.
+    """
     
-    def __init__(self, endpoint: str = "ws://localhost:8080/ws"):
+    def __init__(
+        self,
+        endpoint: str = "ws://localhost:8080/ws",
+        compression: Optional[str] = None,
+    ):
         self.endpoint = endpoint
+        self.compression = compression
         self.websocket = None
         
     async def connect(self):
         """Conecta ao WebSocket"""
-        self.websocket = await websockets.connect(self.endpoint)
+        self.websocket = await websockets.connect(
+            self.endpoint,
+            compression=self.compression,
+            max_size=2 ** 22,
+            max_queue=1024,
+            ping_interval=20,
+            ping_timeout=20,
+            write_limit=2 ** 20,
+            open_timeout=5,
+        )
         
     async def disconnect(self):
         """Desconecta do WebSocket"""
@@ -315,26 +676,85 @@ class SyrosWebSocketClient:
         if not self.websocket:
             raise RuntimeError("WebSocket não conectado")
             
-        await self.websocket.send(json.dumps({"type": "ping"}))
+        await self.websocket.send(orjson.dumps({"type": "ping"}).decode())
         
     async def subscribe(self):
         """Inscreve-se para receber eventos"""
         if not self.websocket:
             raise RuntimeError("WebSocket não conectado")
             
-        await self.websocket.send(json.dumps({"type": "subscribe"}))
+        await self.websocket.send(orjson.dumps({"type": "subscribe"}).decode())
         
-    async def listen_for_events(self, callback):
-        """Escuta eventos e chama callback para cada evento"""
+    async def listen_for_events(self, callback, workers: int = 1, queue_size: int = 1024):
+        """Escuta eventos e chama callback para cada evento
+        
+        A leitura do socket e a decodificação/callback rodam em tarefas
+        separadas, ligadas por uma fila limitada, para que callbacks lentos
+        não atrasem a recepção. Com `workers` > 1 os callbacks rodam em
+        paralelo e a ordem dos eventos deixa de ser garantida.
+        """
         if not self.websocket:
             raise RuntimeError("WebSocket não conectado")
-            
-        async for message in self.websocket:
-            try:
-                data = json.loads(message)
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        
+        async def produce():
+            async for message in self.websocket:
+                await queue.put(message)
+            for _ in range(workers):
+                await queue.put(None)
+        
+        async def consume():
+            loop = asyncio.get_running_loop()
+            while True:
+                message = await queue.get()
+                if message is None:
+                    return
+                try:
+                    # Mensagens grandes são decodificadas fora do event loop
+                    if len(message) < _OFFLOAD_DECODE_SIZE:
+                        data = orjson.loads(message)
+                    else:
+                        data = await loop.run_in_executor(None, orjson.loads, message)
+                except orjson.JSONDecodeError:
+                    print(f"Erro ao decodificar mensagem: {message}")
+                    continue
                 await callback(data)
-            except json.JSONDecodeError:
-                print(f"Erro ao decodificar mensagem: {message}")
+        
+        tasks = [asyncio.ensure_future(produce())]
+        tasks += [asyncio.ensure_future(consume()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+_default_client: Optional[SyrosClient] = None
+
+
+def get_default_client(
+    endpoint: Optional[str] = None, api_key: Optional[str] = None
+) -> SyrosClient:
+    """Cliente compartilhado do processo, para uso fora de `async with`.
+    
+    Criado na primeira chamada com os argumentos informados (endpoint
+    padrão: http://localhost:8080); chamadas seguintes retornam a mesma
+    instância (e o mesmo pool de conexões). Argumentos omitidos aceitam o
+    cliente existente; argumentos diferentes dos dele levantam ValueError.
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = SyrosClient(endpoint or "http://localhost:8080", api_key)
+    elif (
+        (endpoint is not None and endpoint.rstrip('/') != _default_client.endpoint)
+        or (api_key is not None and api_key != _default_client.api_key)
+    ):
+        raise ValueError(
+            f"Cliente padrão já criado para {_default_client.endpoint} com outras credenciais"
+            f" ou endpoint; crie um SyrosClient próprio para {endpoint or _default_client.endpoint}"
+        )
+    return _default_client
 
 
 # Exemplo de uso
@@ -347,32 +767,31 @@ async def exemplo_uso():
         health = await client.health_check()
         print(f"Status da plataforma: {health}")
         
-        # Adquirir lock
         lock_request = LockRequest(
             key="meu-recurso",
             owner="cliente-python",
             ttl_seconds=60
         )
-        
-        lock_response = await client.acquire_lock(lock_request)
-        print(f"Lock adquirido: {lock_response}")
-        
-        # Liberar lock
-        release_result = await client.release_lock("meu-recurso")
-        print(f"Lock liberado: {release_result}")
-        
-        # Usar cache
         cache_request = CacheRequest(
             key="meu-cache",
             value={"dados": "importantes"},
             ttl_seconds=300
         )
         
-        cache_response = await client.set_cache(cache_request)
+        # Adquirir lock e definir cache: operações independentes, em paralelo
+        lock_response, cache_response = await asyncio.gather(
+            client.acquire_lock(lock_request),
+            client.set_cache(cache_request),
+        )
+        print(f"Lock adquirido: {lock_response}")
         print(f"Cache definido: {cache_response}")
         
-        # Obter cache
-        cache_data = await client.get_cache("meu-cache")
+        # Liberar lock e obter cache, também em paralelo
+        release_result, cache_data = await client.batch([
+            client.release_lock("meu-recurso"),
+            client.get_cache("meu-cache"),
+        ])
+        print(f"Lock liberado: {release_result}")
         print(f"Cache obtido: {cache_data}")
     
     # Cliente WebSocket
@@ -387,4 +806,5 @@ async def exemplo_uso():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(exemplo_uso())